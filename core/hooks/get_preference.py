@@ -8,10 +8,14 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+
 """
 Hook which looks up a DD Preference value.
 """
 
+import threading
+import time
+
 import sgtk
 HookBaseClass = sgtk.get_hook_baseclass()
 
@@ -24,16 +28,27 @@ import preferences
 import logging
 preferences.logger.setLevel(logging.INFO)
 
+# Seconds a cached Preferences object is reused before it is rebuilt, so that
+# edits to the preference files are picked up by long running sessions.
+# Use clear_preferences_cache to pick them up right away.
+PREFERENCES_CACHE_TTL = 60
+
 
 class GetPreference(HookBaseClass):
 
+    # process-wide cache of Preferences objects, shared by every instance of
+    # this hook (settings resolution and execute_core_hook_method callers)
+    _preferences_cache = {}
+    _preferences_cache_stats = {"hits": 0, "misses": 0}
+    _preferences_cache_lock = threading.Lock()
+
     def execute(self, setting, settings_type, bundle_obj, extra_params, **kwargs):
         """
         Uses the Preferences system to lookup a value for the passed in key
         """
         key = '%s.%s' % (bundle_obj.name, setting)
         default = dict(enumerate(extra_params)).get(0, None)
-        prefs = preferences.Preferences(package="sgtk_config")
+        prefs = self.get_preferences(package="sgtk_config")
 
         value = prefs.get(key, default)
         if settings_type == "int":
@@ -44,3 +59,71 @@ class GetPreference(HookBaseClass):
             value = str(value)
 
         return value
+
+    def get_preferences(self, package=None, pref_file_name=None, role=None,
+                        seq_override=None, shot_override=None):
+        """
+        Returns a Preferences object for the given arguments, reusing a
+        previously built one for up to PREFERENCES_CACHE_TTL seconds.
+
+        Other hooks can reach this through
+        ``tk.execute_core_hook_method("get_preference", "get_preferences", ...)``.
+
+        :returns: preferences.Preferences object
+        """
+        kwargs = dict((name, value) for name, value in (("package", package),
+                                                        ("pref_file_name", pref_file_name),
+                                                        ("role", role),
+                                                        ("seq_override", seq_override),
+                                                        ("shot_override", shot_override))
+                      if value is not None)
+        cache_key = (package, pref_file_name, role, seq_override, shot_override)
+        cls = self.__class__
+
+        with cls._preferences_cache_lock:
+            cached = cls._preferences_cache.get(cache_key)
+
+        if cached and self._is_cache_entry_valid(cached):
+            with cls._preferences_cache_lock:
+                cls._preferences_cache_stats["hits"] += 1
+            return cached["prefs"]
+
+        prefs = preferences.Preferences(**kwargs)
+        entry = {
+            "prefs": prefs,
+            "created": time.time(),
+        }
+
+        with cls._preferences_cache_lock:
+            cls._preferences_cache[cache_key] = entry
+            cls._preferences_cache_stats["misses"] += 1
+
+        return prefs
+
+    def get_preferences_cache_stats(self):
+        """
+        Returns the hit/miss counters of the preferences cache.
+
+        :returns: dict with "hits", "misses" and "size" keys
+        """
+        cls = self.__class__
+        with cls._preferences_cache_lock:
+            stats = dict(cls._preferences_cache_stats)
+            stats["size"] = len(cls._preferences_cache)
+        return stats
+
+    def clear_preferences_cache(self):
+        """
+        Drops every cached Preferences object and resets the counters.
+        """
+        cls = self.__class__
+        with cls._preferences_cache_lock:
+            cls._preferences_cache.clear()
+            cls._preferences_cache_stats.update(hits=0, misses=0)
+
+    @staticmethod
+    def _is_cache_entry_valid(entry):
+        """
+        A cache entry is valid for PREFERENCES_CACHE_TTL seconds.
+        """
+        return time.time() - entry["created"] < PREFERENCES_CACHE_TTL
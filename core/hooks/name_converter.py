@@ -22,6 +22,8 @@ HookBaseClass = sgtk.get_hook_baseclass()
 EDIT_TYPES_KEY = "edit_types"
 EDITS_KEY = "edits"
 VALID_EDITS = ["replace", "lower_case", "upper_case", "underscore_to_camelcase", "pad", "path_safe"]
+# maximum number of edited values remembered per edit signature, the values are cleared when it is reached
+EDIT_CACHE_SIZE = 10000
 
 
 class TemplateKeyCustom(HookBaseClass):
@@ -38,15 +40,112 @@ class TemplateKeyCustom(HookBaseClass):
         return self.parent._validate(value, validate_transforms)
 
 
+    # (compiled edits, edited values) keyed by the edit signature of a template key
+    _compiled_edits = {}
+    # (edit_types, edits, edit signature) keyed by the ids of the edit_types and edits settings.
+    # the settings are kept referenced by the entry, so their ids can't be handed to other objects.
+    _edit_signatures = {}
+
     @staticmethod
     def _underscore_to_camelcase(value):
-        def camelcase():
-            yield str.lower
-            while True:
-                yield str.capitalize
+        parts = []
+        first = True
+        for part in value.split("_"):
+            if not part:
+                parts.append("_")
+            elif first:
+                parts.append(part.lower())
+                first = False
+            else:
+                parts.append(part.capitalize())
+        return "".join(parts)
+
+    @staticmethod
+    def _make_replace_edit(relevant_edits):
+        if not relevant_edits:
+            return None
+        replaces = list(relevant_edits.items())
+
+        def replace_edit(value):
+            # only the replacements matching the incoming value are applied
+            for replace, replace_with in [item for item in replaces if item[0] in value]:
+                value = value.replace(replace, replace_with)
+            return value
+        return replace_edit
+
+    @staticmethod
+    def _make_pad_edit(relevant_edits):
+        if not relevant_edits or "value" not in relevant_edits:
+            return None
+        padding = relevant_edits["value"]
+        return lambda value: value.zfill(padding)
+
+    @classmethod
+    def _make_edit(cls, edit, relevant_edits):
+        """
+        Returns a callable applying a single edit to a value, or None if the
+        edit doesn't change anything with the given "edits" mapping.
+        """
+        if edit == "replace":
+            return cls._make_replace_edit(relevant_edits)
+        elif edit == "lower_case":
+            return lambda value: value.lower()
+        elif edit == "upper_case":
+            return lambda value: value.upper()
+        elif edit == "underscore_to_camelcase":
+            return cls._underscore_to_camelcase
+        elif edit == "pad":
+            return cls._make_pad_edit(relevant_edits)
+        elif edit == "path_safe":
+            return lambda value: urllib.quote(value.replace(" ", "_"), safe='')
+        return None
+
+    @classmethod
+    def _compile_edits(cls, edit_types, edits):
+        """
+        Composes the edits of a template key into a single callable.
+        """
+        # don't forget to add a new edit to VALID_EDITS
+        functions = []
+        for edit in edit_types:
+            if edit in VALID_EDITS:
+                function = cls._make_edit(edit, edits.get(edit, dict()))
+                if function:
+                    functions.append(function)
+
+        def compiled(value):
+            for function in functions:
+                value = function(value)
+            return value
 
-        c = camelcase()
-        return "".join(c.next()(x) if x else '_' for x in value.split("_"))
+        return compiled
+
+    @classmethod
+    def _edit_signature(cls, obj):
+        """
+        Returns a hashable representation of the edit_types/edits settings.
+        """
+        if isinstance(obj, dict):
+            return tuple(sorted((key, cls._edit_signature(value)) for key, value in obj.iteritems()))
+        elif isinstance(obj, (list, tuple)):
+            return tuple([cls._edit_signature(value) for value in obj])
+        return obj
+
+    @classmethod
+    def _get_edit_signature(cls, edit_types, edits):
+        """
+        Returns the edit signature of the edit_types/edits settings of a template key,
+        which are the same objects on every call for a key.
+        """
+        entry = cls._edit_signatures.get((id(edit_types), id(edits)))
+
+        if entry is None or entry[0] is not edit_types or entry[1] is not edits:
+            if len(cls._edit_signatures) >= EDIT_CACHE_SIZE:
+                cls._edit_signatures.clear()
+            entry = (edit_types, edits, (cls._edit_signature(edit_types), cls._edit_signature(edits)))
+            cls._edit_signatures[(id(edit_types), id(edits))] = entry
+
+        return entry[2]
 
     def _run_edits(self, edit_types, edits, value):
         """
@@ -56,38 +155,28 @@ class TemplateKeyCustom(HookBaseClass):
         You can also define a set of EDITS_KEY(edits) in the TemplateKey.
         eg. use "edits" to store the replacement mapping for "replace" type "edit".
         """
-        # apply the edits on the value of the key
-        edits = edits or dict()
-        edit_types = edit_types or list()
-
-        # don't forget to add a new edit to VALID_EDITS
-        for edit in edit_types:
-            relevant_edits = dict()
-            if edit in edits:
-                relevant_edits = edits[edit]
-
-            if edit in VALID_EDITS:
-                if edit == "replace":
-                    if relevant_edits:
-                        relevant_replaces = [replace for replace in relevant_edits if replace in value]
-                        for replace in relevant_replaces:
-                            value = value.replace(replace, relevant_edits[replace])
-                elif edit == "lower_case":
-                    value = value.lower()
-                elif edit == "upper_case":
-                    value = value.upper()
-                elif edit == "underscore_to_camelcase":
-                    value = self._underscore_to_camelcase(value)
-                elif edit == "pad":
-                    if relevant_edits:
-                        if "value" in relevant_edits:
-                            padding = relevant_edits["value"]
-                            value = value.zfill(padding)
-                elif edit == "path_safe":
-                    value = urllib.quote(value.replace(" ", "_"), safe='')
-
-        return value
-        
+        cls = self.__class__
+        signature = self._get_edit_signature(edit_types, edits)
+
+        try:
+            compiled, edited_values = cls._compiled_edits[signature]
+        except KeyError:
+            # apply the edits on the value of the key
+            compiled = self._compile_edits(edit_types or list(), edits or dict())
+            compiled, edited_values = cls._compiled_edits.setdefault(signature, (compiled, {}))
+
+        try:
+            return edited_values[value]
+        except KeyError:
+            pass
+
+        result = compiled(value)
+        # the edited values are bounded, and simply forgotten once the limit is reached
+        if len(edited_values) >= EDIT_CACHE_SIZE:
+            edited_values.clear()
+        edited_values[value] = result
+
+        return result
 
     def value_from_str(self, str_value, **kwargs):
         """
@@ -17,30 +17,75 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 class PickEnvironment(HookBaseClass):
 
+    # environment names already picked, keyed by context signature
+    _environment_cache = {}
+    _environment_cache_stats = {"hits": 0, "misses": 0}
+
     def execute(self, context, **kwargs):
         """
         The default implementation assumes there are three environments, called shot, asset
         and project, and switches to these based on entity type.
         """
-        if context.source_entity:
-            if context.source_entity["type"] in ["Version", "PublishedFile"]:
-                return "publishedfile_version"
+        signature = self._context_signature(context)
+
+        cls = self.__class__
+        try:
+            env_name = cls._environment_cache[signature]
+            cls._environment_cache_stats["hits"] += 1
+        except KeyError:
+            env_name = self._pick_environment(*signature)
+            cls._environment_cache[signature] = env_name
+            cls._environment_cache_stats["misses"] += 1
+
+        return env_name
+
+    def get_cache_stats(self):
+        """
+        Returns the hit/miss counters of the environment cache, for profiling.
+
+        :returns: dict with "hits", "misses" and "size" keys
+        """
+        stats = dict(self.__class__._environment_cache_stats)
+        stats["size"] = len(self.__class__._environment_cache)
+        return stats
+
+    @staticmethod
+    def _context_signature(context):
+        """
+        Reduces a context to the parts which decide the environment.
+        """
+        source_entity_type = context.source_entity["type"] if context.source_entity else None
+        entity_type = context.entity["type"] if context.entity else None
+        addl_entity_types = frozenset(x["type"] for x in context.additional_entities or [])
+
+        return (source_entity_type,
+                context.project is not None,
+                context.step is not None,
+                entity_type,
+                addl_entity_types)
+
+    @staticmethod
+    def _pick_environment(source_entity_type, has_project, has_step, entity_type, addl_entity_types):
+        """
+        Picks the environment name from a context signature.
+        """
+        if source_entity_type in ["Version", "PublishedFile"]:
+            return "publishedfile_version"
 
-        if context.project is None:
+        if not has_project:
             # our context is completely empty!
             # return the "site" configuration.
             return "site"
 
-        if context.step is None:
+        if not has_step:
             # we aren't in a Task context so return the base env
             return "base"
 
-        if context.entity is None:
+        if entity_type is None:
             # we have a project but not an entity
             return "project"
         else:
             # we have an entity
-            entity_type = context.entity["type"]
             if entity_type == "Sequence":
                 return "sequence"
             elif entity_type == "Shot":
@@ -48,7 +93,6 @@ class PickEnvironment(HookBaseClass):
             elif entity_type == "Project":
                 return "project"
             else:
-                addl_entity_types = [x["type"] for x in context.additional_entities]
                 if "Shot" in addl_entity_types:
                     return "shot_%s" % entity_type.lower()
                 if "Sequence" in addl_entity_types:
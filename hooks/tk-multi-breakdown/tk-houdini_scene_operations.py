@@ -14,6 +14,15 @@ from tank import Hook
 
 import hou
 
+# node types handled by the breakdown, in the order they are reported by scan_scene,
+# (node type category, node type, item type, file parm name)
+SCAN_NODE_TYPES = (
+    ("Object", "alembicarchive", "alembic", "fileName"),
+    ("Sop", "file", "file", "file"),
+    ("Object", "cam", "cam", "vm_background"),
+)
+
+
 class BreakdownSceneOperations(Hook):
     """
     Breakdown operations for Houdini.
@@ -44,51 +53,52 @@ class BreakdownSceneOperations(Hook):
 
         items = []
 
-        # get a list of all regular alembic nodes in the file
-        alembic_nodes = hou.nodeType(hou.objNodeTypeCategory(),
-            "alembicarchive").instances()
+        # normalized file paths of the parms without expressions/variables, keyed by the raw parm string.
+        # this is only kept for the scan, since the scene and the environment can change in between.
+        parm_path_cache = {}
+        node_type_categories = hou.nodeTypeCategories()
 
-        # return an item for each alembic node found. the breakdown app will check
+        # return an item for each node of the types we handle. the breakdown app will check
         # the paths of each looking for a template match and a newer version.
-        for alembic_node in alembic_nodes:
-
-            file_parm = alembic_node.parm("fileName")
-            file_path = os.path.normpath(file_parm.eval())
+        for category_name, node_type_name, item_type, parm_name in SCAN_NODE_TYPES:
+            node_type = hou.nodeType(node_type_categories[category_name], node_type_name)
+            if not node_type:
+                continue
+
+            for node in node_type.instances():
+                file_parm = node.parm(parm_name)
+                if not file_parm:
+                    continue
+
+                items.append({
+                    "node": node.path(),
+                    "type": item_type,
+                    "path": self._eval_file_parm(file_parm, parm_path_cache),
+                })
 
-            items.append({
-                "node": alembic_node.path(),
-                "type": "alembic",
-                "path": file_path,
-            })
-
-        # get a list of all regular file nodes in the file
-        file_nodes = hou.nodeType(hou.sopNodeTypeCategory(),
-            "file").instances()
-
-        for file_node in file_nodes:
-            file_parm = file_node.parm("file")
-            file_path = os.path.normpath(file_parm.eval())
+        return items
 
-            items.append({
-                "node": file_node.path(),
-                "type": "file",
-                "path": file_path,
-            })
+    def _eval_file_parm(self, file_parm, parm_path_cache):
+        """
+        Evaluates a file parm to a normalized path.
+        Parms without any expression or variable are served from the parm path cache.
 
-        cam_nodes = hou.nodeType(hou.objNodeTypeCategory(),
-                                  "cam").instances()
+        :param file_parm: hou.Parm to evaluate
+        :param parm_path_cache: Dictionary of normalized paths keyed by raw parm string
+        """
+        try:
+            raw_value = file_parm.unexpandedString()
+        except hou.OperationFailed:
+            # the parm is driven by keyframes/an expression
+            return os.path.normpath(file_parm.eval())
 
-        for cam_node in cam_nodes:
-            file_parm = cam_node.parm("vm_background")
-            file_path = os.path.normpath(file_parm.eval())
+        if "$" in raw_value or "`" in raw_value:
+            return os.path.normpath(file_parm.eval())
 
-            items.append({
-                "node": cam_node.path(),
-                "type": "cam",
-                "path": file_path,
-            })
+        if raw_value not in parm_path_cache:
+            parm_path_cache[raw_value] = os.path.normpath(file_parm.eval())
 
-        return items
+        return parm_path_cache[raw_value]
 
     def update(self, items):
         """
@@ -104,6 +114,12 @@ class BreakdownSceneOperations(Hook):
 
         engine = self.parent.engine
 
+        # path -> template, for the camera paths
+        templates = {}
+
+        # alembic archives to rebuild once all the items are updated, keyed by node path
+        alembic_nodes_to_build = {}
+
         # these items are to be updated. swap out the fileName parm value with the
         # new path as supplied by the breakdown app.
         for item in items:
@@ -121,7 +137,7 @@ class BreakdownSceneOperations(Hook):
                 engine.log_debug(
                     "Updating alembic archive node '%s' to: %s" % (node_path, file_path))
                 alembic_node.parm("fileName").set(file_path)
-                alembic_node.parm("buildHierarchy").pressButton()
+                alembic_nodes_to_build[node_path] = alembic_node
             elif node_type == "file":
                 file_node = hou.node(node_path)
                 engine.log_debug(
@@ -131,7 +147,9 @@ class BreakdownSceneOperations(Hook):
                 cam_node = hou.node(node_path)
                 # replace any %0#d format string with the corresponding houdini frame
                 # env variable. example %04d => $F4
-                template = self.sgtk.template_from_path(file_path)
+                if file_path not in templates:
+                    templates[file_path] = self.sgtk.template_from_path(file_path)
+                template = templates[file_path]
                 fields = template.get_fields(file_path)
                 if fields.get('SEQ'):
                     fields['SEQ'] = 'FORMAT: $F'
@@ -141,3 +159,7 @@ class BreakdownSceneOperations(Hook):
                     "Updating camera node '%s' to: %s" % (node_path, file_path))
                 cam_node.parm("vm_background").set(file_path)
 
+        # rebuild each alembic archive once, even if it was updated several times
+        for node_path in sorted(alembic_nodes_to_build):
+            engine.log_debug("Building hierarchy of alembic archive node '%s'" % node_path)
+            alembic_nodes_to_build[node_path].parm("buildHierarchy").pressButton()
@@ -8,6 +8,9 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import time
+from contextlib import contextmanager
+
 import maya.cmds as cmds
 import pymel.core as pm
 import sgtk
@@ -31,24 +34,64 @@ class BreakdownSceneOperations(HookBaseClass):
         The items parameter is a list of dictionaries on the same form as was
         generated by the scan_scene hook above. The path key now holds
         the that each node should be updated *to* rather than the current path.
+
+        The items are updated in bulk: references first, parents before their
+        sub-references, then the file texture nodes, with the viewport refresh
+        and texture loading deferred until the whole batch is done.
         """
 
         engine = self.parent.engine
         app_object = engine.apps["tk-multi-breakdown"]
 
-        for i in items:
+        references = [i for i in items if i["type"] == "reference"]
+        textures = [i for i in items if i["type"] == "file"]
+
+        # node name -> template, built from a single analyze_scene pass when the first
+        # single texture needs it
+        template_index = None
+        # (template name, path) -> fields
+        fields_cache = {}
+
+        # (node type, node, seconds) for every updated item
+        timings = []
+        start_time = time.time()
+
+        with self._deferred_evaluation():
+
+            for i in self._sort_references(references):
+
+                node = i["node"]
+                new_path = i["path"]
+                item_start_time = time.time()
 
-            node = i["node"]
-            node_type = i["type"]
-            new_path = i["path"]
+                # replacing a parent reference reloads its sub-references, which can already
+                # be pointing to the new path or not exist anymore.
+                if not cmds.objExists(node):
+                    engine.log_debug("Maya Reference %s: Skipped, reloaded with its parent reference" % node)
+                    continue
+
+                if cmds.referenceQuery(node, filename=True, withoutCopyNumber=True) == new_path:
+                    engine.log_debug("Maya Reference %s: Already at version %s" % (node, new_path))
+                    continue
 
-            if node_type == "reference":
                 # maya reference
                 engine.log_debug("Maya Reference %s: Updating to version %s" % (node, new_path))
                 rn = pm.system.FileReference(node)
                 rn.replaceWith(new_path)
 
-            elif node_type == "file":
+                timings.append(("reference", node, time.time() - item_start_time))
+
+            for i in textures:
+
+                node = i["node"]
+                new_path = i["path"]
+                item_start_time = time.time()
+
+                # texture nodes from a replaced reference might not exist anymore
+                if not cmds.objExists(node):
+                    engine.log_debug("File Texture %s: Skipped, node doesn't exist anymore" % node)
+                    continue
+
                 # file texture node
                 engine.log_debug("File Texture %s: Updating to version %s" % (node, new_path))
 
@@ -67,16 +110,82 @@ class BreakdownSceneOperations(HookBaseClass):
                 # update texture if it is single texture
                 if tex_type == "SINGLE_TEXTURE":
                     # get texture template object
-                    tex_template_obj = self.get_template_object(app_object, node)
+                    if template_index is None:
+                        template_index = self.get_template_index(app_object)
+                    tex_template_obj = self.get_template_object(app_object, node, template_index)
                     old_texture = cmds.getAttr("%s.fileTextureName" % node)
 
-                    old_texture_fields = tex_template_obj.get_fields(old_texture)
-                    new_texture_fields = tex_template_obj.get_fields(new_path)
+                    old_texture_fields = self._get_template_fields(tex_template_obj, old_texture, fields_cache)
+                    new_texture_fields = self._get_template_fields(tex_template_obj, new_path, fields_cache)
                     new_path = new_path.replace(str(new_texture_fields['SEQ']), str(old_texture_fields['SEQ']))
 
                 cmds.setAttr("%s.fileTextureName" % node, new_path, type="string")
 
-    def get_template_object(self, app_object, node_name):
-        for tex in app_object.analyze_scene():
-            if tex['node_name'] == node_name:
-             return tex["template"]
+                timings.append(("file", node, time.time() - item_start_time))
+
+        for node_type, node, seconds in timings:
+            engine.log_debug("Updated %s %s in %.2fs" % (node_type, node, seconds))
+
+        engine.log_info("Updated %d references and %d file textures in %.2fs" %
+                        (len([t for t in timings if t[0] == "reference"]),
+                         len([t for t in timings if t[0] == "file"]),
+                         time.time() - start_time))
+
+    @contextmanager
+    def _deferred_evaluation(self):
+        """
+        Context manager that suspends the viewport refresh and defers the texture loading
+        of the materials for the duration of a bulk update.
+        """
+        material_loading_mode = None
+        try:
+            material_loading_mode = cmds.displayPref(query=True, materialLoadingMode=True)
+            cmds.displayPref(materialLoadingMode="deferred")
+        except (RuntimeError, TypeError):
+            # not supported by this version of maya
+            material_loading_mode = None
+
+        cmds.refresh(suspend=True)
+        try:
+            yield
+        finally:
+            cmds.refresh(suspend=False)
+            if material_loading_mode:
+                cmds.displayPref(materialLoadingMode=material_loading_mode)
+            cmds.refresh(force=True)
+
+    def _sort_references(self, references):
+        """
+        Sorts the reference items so that parent references are replaced before their
+        sub-references, a shared sub-reference is then only reloaded once.
+        """
+        def depth(item):
+            node_depth = 0
+            parent_node = cmds.referenceQuery(item["node"], referenceNode=True, parent=True)
+            while parent_node:
+                node_depth += 1
+                parent_node = cmds.referenceQuery(parent_node, referenceNode=True, parent=True)
+            return node_depth
+
+        return sorted(references, key=depth)
+
+    def get_template_index(self, app_object):
+        """
+        Maps the node names of the scene items to their template, using a single analyze_scene pass.
+        """
+        return dict((tex['node_name'], tex["template"]) for tex in app_object.analyze_scene())
+
+    def get_template_object(self, app_object, node_name, template_index=None):
+        if template_index is None:
+            template_index = self.get_template_index(app_object)
+        return template_index.get(node_name)
+
+    def _get_template_fields(self, template, path, fields_cache):
+        """
+        Returns template.get_fields(path), memoized in fields_cache.
+        """
+        key = (template.name, path)
+        if key not in fields_cache:
+            fields_cache[key] = template.get_fields(path)
+        return fields_cache[key]
+
@@ -9,12 +9,27 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import re
+import time
 import nuke
 
 import sgtk
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# node classes handled by the breakdown, in the order they are reported by scan_scene
+NODE_CLASSES = ("Read", "ReadGeo2", "Camera2", "DeepRead")
+
+# Shot Step short names used to filter the hiero bins, shared by all the instances of the hook
+SHOT_STEPS_CACHE = {"steps": None, "timestamp": 0}
+# seconds after which the Shot Step short names are queried again
+SHOT_STEPS_CACHE_TTL = 300
+
+# hash padding of a file sequence, eg. ####
+HASH_PADDING_REGEX = re.compile(r"#+")
+# frame number of a file in a sequence, right before the extension
+FRAME_NUMBER_REGEX = re.compile(r"(\d+)(\.\w+)$")
+
 
 class BreakdownSceneOperations(HookBaseClass):
     """
@@ -55,20 +70,17 @@ class BreakdownSceneOperations(HookBaseClass):
             import hiero
 
             # scan for only valid pipeline steps (shot entity)
-            filters = [["entity_type", "is", "Shot"]]
-            fields = ["short_name"]
-            result = self.parent.sgtk.shotgun.find("Step", filters, fields)
-            steps = list(set([step["short_name"] for step in result]))
+            steps = self._get_shot_step_names()
 
             for project in hiero.core.projects():
                 for bin in project.clipsBin().bins():
 
                     if bin.name() in steps:
 
+                        # one item per clip, pointing to the clip's sequence path
                         for clip in bin.clips():
-                            files = clip.activeItem().mediaSource().fileinfos()
-                            for file in files:
-                                path = file.filename().replace("/", os.path.sep)
+                            path = self._get_clip_sequence_path(clip)
+                            if path:
                                 reads.append(
                                     dict(
                                         node=clip.activeItem(),
@@ -81,31 +93,63 @@ class BreakdownSceneOperations(HookBaseClass):
         if self.parent.engine.studio_enabled or self.parent.engine.hiero_enabled:
             return reads
 
-        # first let's look at the read nodes
-        for node in nuke.allNodes("Read"):
-            node_name = node.name()
+        # read, read geometry, camera and deep read nodes, in one pass
+        reads.extend(self._scan_nodes())
+
+        return reads
+
+    def _scan_nodes(self):
+        """
+        Scans the nodes of the supported classes, including the ones inside groups, in a single pass.
+
+        :return: list of breakdown items, sorted by node class and name
+        """
+        nodes = []
+        for node in nuke.allNodes(recurseGroups=True):
+            node_class = node.Class()
+            if node_class not in NODE_CLASSES:
+                continue
 
             # note! We are getting the "abstract path", so contains
             # %04d and %V rather than actual values.
             path = node.knob('file').value().replace("/", os.path.sep)
+            nodes.append(dict(node=node.fullName(), type=node_class, path=path))
+
+        return sorted(nodes, key=lambda item: (NODE_CLASSES.index(item["type"]), item["node"]))
+
+    def _get_shot_step_names(self):
+        """
+        Returns the set of short names of the Shot Steps, cached for SHOT_STEPS_CACHE_TTL seconds.
+        """
+        if SHOT_STEPS_CACHE["steps"] is None or \
+                time.time() - SHOT_STEPS_CACHE["timestamp"] > SHOT_STEPS_CACHE_TTL:
+            filters = [["entity_type", "is", "Shot"]]
+            fields = ["short_name"]
+            result = self.parent.sgtk.shotgun.find("Step", filters, fields)
 
-            reads.append({"node": node_name, "type": "Read", "path": path})
+            SHOT_STEPS_CACHE["steps"] = set([step["short_name"] for step in result])
+            SHOT_STEPS_CACHE["timestamp"] = time.time()
 
-        # then the read geometry nodes
-        for node in nuke.allNodes("ReadGeo2"):
-            node_name = node.name()
+        return SHOT_STEPS_CACHE["steps"]
 
-            path = node.knob('file').value().replace("/", os.path.sep)
-            reads.append({"node": node_name, "type": "ReadGeo2", "path": path})
+    def _get_clip_sequence_path(self, clip):
+        """
+        Returns the path of the media of a clip, using a %0Nd frame pattern for file sequences.
 
-        # then the read camera nodes
-        for node in nuke.allNodes("Camera2"):
-            node_name = node.name()
+        :param clip: hiero BinItem
+        :return: path or None if the clip has no media
+        """
+        files = clip.activeItem().mediaSource().fileinfos()
+        if not files:
+            return None
 
-            path = node.knob('file').value().replace("/", os.path.sep)
-            reads.append({"node": node_name, "type": "Camera2", "path": path})
+        path = HASH_PADDING_REGEX.sub(lambda match: "%%0%dd" % len(match.group(0)), files[0].filename())
 
-        return reads
+        if len(files) > 1:
+            # one file info per frame, use the frame number of the first one as the frame pattern
+            path = FRAME_NUMBER_REGEX.sub(lambda match: "%%0%dd%s" % (len(match.group(1)), match.group(2)), path)
+
+        return path.replace("/", os.path.sep)
 
     def update(self, items):
         """
@@ -120,27 +164,64 @@ class BreakdownSceneOperations(HookBaseClass):
         """
         engine = self.parent.engine
 
-        node_type_list = ["Read", "ReadGeo2", "Camera2", "DeepRead"]
-
-        for i in items:
-            node_name = i["node"]
-            node_type = i["type"]
-            new_path = i["path"].replace(os.path.sep, "/")
+        # resolved once for the whole batch
+        additional_publish_fields = self.parent.get_setting("additional_publish_fields")
+        knob_labels = self._get_metadata_knob_labels(additional_publish_fields)
+
+        # a single undo step for the whole batch, hiero doesn't have a node graph to undo.
+        undo = None
+        if not engine.hiero_enabled:
+            undo = nuke.Undo()
+            undo.begin("Breakdown Update")
+
+        try:
+            for i in items:
+                node_name = i["node"]
+                node_type = i["type"]
+                new_path = i["path"].replace(os.path.sep, "/")
+
+                if node_type in NODE_CLASSES:
+                    node = nuke.toNode(node_name)
+                    if node is None:
+                        engine.log_warning("Node %s: Not found in the script, not updating it." % node_name)
+                        continue
+
+                    if node.knob("file").value() == new_path:
+                        engine.log_debug("Node %s: Already at version %s" % (node_name, new_path))
+                        continue
+
+                    engine.log_debug("Node %s: Updating to version %s" % (node_name, new_path))
+                    node.knob("file").setValue(new_path)
+
+                    if i.get("sg_data"):
+                        self._update_node_metadata(node, new_path, i["sg_data"],
+                                                   additional_publish_fields, knob_labels)
+
+                if node_type == "Clip":
+                    engine.log_debug("Clip %s: Updating to version %s" % (node_name, new_path))
+                    clip = node_name
+                    clip.reconnectMedia(new_path)
+        finally:
+            if undo:
+                undo.end()
+
+    def _get_metadata_knob_labels(self, additional_publish_fields):
+        """
+        Returns the labels of the SGTK tab knobs, keyed by publish field.
 
-            if node_type in node_type_list:
-                engine.log_debug("Node %s: Updating to version %s" % (node_name, new_path))
-                node = nuke.toNode(node_name)
-                node.knob("file").setValue(new_path)
+        :param additional_publish_fields: list of publish fields stored on the nodes
+        """
+        knob_labels = {}
 
-                if i.get("sg_data"):
-                    self._update_node_metadata(node, new_path, i["sg_data"])
+        for publish_field in additional_publish_fields:
+            # create a pretty name for the knob
+            knob_name = publish_field.replace("sg_", "")
+            knob_name = knob_name.replace("_", " ")
+            knob_labels[publish_field] = knob_name.title()
 
-            if node_type == "Clip":
-                engine.log_debug("Clip %s: Updating to version %s" % (node_name, new_path))
-                clip = node_name
-                clip.reconnectMedia(new_path)
+        return knob_labels
 
-    def _update_node_metadata(self, node, path, sg_publish_data):
+    def _update_node_metadata(self, node, path, sg_publish_data, additional_publish_fields=None, knob_labels=None):
         """
         Bakes/Updates the additional metadata on the read node creating a SGTK tab on the node.
 
@@ -149,8 +230,14 @@ class BreakdownSceneOperations(HookBaseClass):
         :param node: Node to store the additional metadata on.
         :param path: Path to file on disk.
         :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
+        :param additional_publish_fields: `additional_publish_fields` setting, resolved if not given.
+        :param knob_labels: Knob labels keyed by publish field, see _get_metadata_knob_labels.
         """
-        additional_publish_fields = self.parent.get_setting("additional_publish_fields")
+        if additional_publish_fields is None:
+            additional_publish_fields = self.parent.get_setting("additional_publish_fields")
+
+        if knob_labels is None:
+            knob_labels = self._get_metadata_knob_labels(additional_publish_fields)
 
         if not node.knob("sgtk_tab"):
             sgtk_tab_knob = nuke.Tab_Knob("sgtk_tab", "SGTK")
@@ -163,10 +250,7 @@ class BreakdownSceneOperations(HookBaseClass):
                 # create the knob if the field has a value now
                 if knob_value and not node.knob(publish_field):
                     new_knob = None
-                    # create a pretty name for the knob
-                    knob_name = publish_field.replace("sg_", "")
-                    knob_name = knob_name.replace("_", " ")
-                    knob_name = knob_name.title()
+                    knob_name = knob_labels[publish_field]
 
                     if isinstance(knob_value, str):
                         new_knob = nuke.String_Knob(publish_field, knob_name)
@@ -17,10 +17,6 @@ import tde4
 import sgtk
 from sgtk.platform.qt import QtGui
 
-from dd.runtime import api
-api.load("preferences")
-import preferences
-
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
@@ -214,10 +210,12 @@ class TDE4Actions(HookBaseClass):
     def _set_camera_fps(self, camera_id):
         # get fps from show_preferences file
         fields = self.parent.engine.context.as_template_fields()
-        show_prefs = preferences.Preferences(pref_file_name="show_preferences.yaml",
-                                             role=fields.get("Step"),
-                                             seq_override=fields.get("Sequence"),
-                                             shot_override=fields.get("Shot"))
+        show_prefs = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name="show_preferences.yaml",
+            role=fields.get("Step"),
+            seq_override=fields.get("Sequence"),
+            shot_override=fields.get("Shot"))
         try:
             fps = show_prefs["show_settings"]["fps"]
         except KeyError as ke:
@@ -231,10 +229,12 @@ class TDE4Actions(HookBaseClass):
     def _set_camera_lens_filmback(self, camera_id):
         # get filmback from camera_preferences file
         fields = self.parent.engine.context.as_template_fields()
-        cam_preferences = preferences.Preferences(pref_file_name='camera_preferences.yaml',
-                                                  role=fields.get("Step"),
-                                                  seq_override=fields.get("Sequence"),
-                                                  shot_override=fields.get("Shot"))
+        cam_preferences = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name='camera_preferences.yaml',
+            role=fields.get("Step"),
+            seq_override=fields.get("Sequence"),
+            shot_override=fields.get("Shot"))
         try:
             primary_cam = cam_preferences['camera_type']
             # setLensFBackHeight() expects cm
@@ -10,12 +10,16 @@
 
 import os
 import datetime
+import itertools
+import logging
 import traceback
 import pprint
 import re
+import threading
 import urllib
 
 from functools import reduce
+from multiprocessing.pool import ThreadPool
 import operator
 
 import sgtk
@@ -75,6 +79,217 @@ DEFAULT_NOTE_TYPES_ACCESS_FALLBACKS = {
 }
 
 
+class ManifestYamlLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """
+    Safe yaml loader used for manifest files, based on the libyaml loader when it is available.
+    Also understands the python scalar tags that yaml.dump writes for longs and unicode strings.
+    """
+    pass
+
+
+ManifestYamlLoader.add_constructor(u"tag:yaml.org,2002:python/long",
+                                   lambda loader, node: long(loader.construct_scalar(node)))
+ManifestYamlLoader.add_constructor(u"tag:yaml.org,2002:python/unicode",
+                                   lambda loader, node: loader.construct_scalar(node))
+ManifestYamlLoader.add_constructor(u"tag:yaml.org,2002:python/str",
+                                   lambda loader, node: loader.construct_scalar(node))
+
+# operator module specific parsing, '%<operator method>:expected_value:expected_result%'
+OPERATOR_MODULE_FILTER_REGEX = re.compile("%(.*):(.*):(.*)%")
+
+# field value operator based parsing, '#<value operator method>:expected_value:expected_result#'
+FIELD_VALUE_OPERATOR_FILTER_REGEX = re.compile("#(.*):(.*):(.*)#")
+
+
+class ManifestFieldFilter(object):
+    """
+    A single entry of the manifest_field_filters item setting, parsed once so that it can
+    be matched against the manifest fields of every collected file.
+    """
+
+    # marker for an expected_result that can't be converted to the type of the operator result
+    _UNCONVERTIBLE = object()
+
+    def __init__(self, field, parser_value):
+        """
+        :param field: Key in manifest_file_fields
+        :param parser_value: '%<operator method>:expected_value:expected_result%' or
+        '#<value operator method>:expected_value:expected_result#'
+        """
+        self.field = field
+        self.parser_value = parser_value
+        self.operator_method = None
+        self.value_operator_method_name = None
+        self.expected_value = "not found"
+        self.expected_result = "not found"
+
+        # expected_result converted to the type returned by the operator, keyed by the type
+        self._typed_expected_results = dict()
+
+        operator_module_match = OPERATOR_MODULE_FILTER_REGEX.match(parser_value)
+        field_value_operator_match = FIELD_VALUE_OPERATOR_FILTER_REGEX.match(parser_value)
+
+        if operator_module_match:
+            operator_method_name, self.expected_value, self.expected_result = operator_module_match.groups()
+            self.operator_method = getattr(operator, operator_method_name)
+        elif field_value_operator_match:
+            self.value_operator_method_name, self.expected_value, self.expected_result = \
+                field_value_operator_match.groups()
+
+    def match(self, field_value):
+        """
+        Match the value of the manifest field against the expected value and result.
+
+        :param field_value: Value of the field in manifest_file_fields
+        :return: True if the filter matches, False otherwise
+        """
+        if self.operator_method:
+            field_value_match = self.operator_method(field_value, self.expected_value)
+        elif self.value_operator_method_name:
+            field_value_match = getattr(field_value, self.value_operator_method_name)(self.expected_value)
+        else:
+            return False
+
+        # if this is not a boolean get the expected result from the info
+        if isinstance(field_value_match, bool):
+            return field_value_match
+
+        value_type = type(field_value_match)
+        if value_type not in self._typed_expected_results:
+            try:
+                self._typed_expected_results[value_type] = value_type(self.expected_result)
+            except:
+                self._typed_expected_results[value_type] = self._UNCONVERTIBLE
+
+        expected_result = self._typed_expected_results[value_type]
+        if expected_result is self._UNCONVERTIBLE:
+            return False
+
+        return field_value_match == expected_result
+
+    def __repr__(self):
+        return "<ManifestFieldFilter %s: %s>" % (self.field, self.parser_value)
+
+
+class TemplateMatchIndex(object):
+    """
+    Index used to match paths against templates.
+
+    Templates are bucketed by the extension and the static prefix of their definition, so that
+    only the templates that can possibly match a path are parsed. The fields parsed from a path are
+    cached per (template, path), so a path is parsed against a template at most once.
+    """
+
+    def __init__(self, templates):
+        """
+        :param templates: list of Template objects to index
+        """
+        self._templates = list(templates)
+        # (static prefix, static suffix) keyed by template name
+        self._static_parts = dict()
+        # {extension: {static prefix: [templates]}}, templates without an extension are under None
+        self._buckets = dict()
+        # prefix lengths present in each extension bucket, longest first
+        self._prefix_lengths = dict()
+        # parsed fields, or None if the path didn't match, keyed by (template name, path)
+        self._fields_cache = dict()
+
+        for template in self._templates:
+            prefix, suffix = self._get_static_parts(template)
+            extension = self._get_extension(suffix)
+            self._buckets.setdefault(extension, dict()).setdefault(prefix, list()).append(template)
+
+        for extension, prefixes in self._buckets.iteritems():
+            self._prefix_lengths[extension] = sorted(set(len(prefix) for prefix in prefixes), reverse=True)
+
+    @staticmethod
+    def _normalize(path):
+        # template parsing is case insensitive and accepts both separators
+        return path.replace("\\", "/").lower()
+
+    @staticmethod
+    def _get_extension(path):
+        """
+        Returns the text after the last dot of the file name, or None if there is none.
+        """
+        extension = path.rsplit(".", 1)[-1] if "." in path else None
+        if extension is None or "/" in extension:
+            return None
+        return extension
+
+    def _get_static_parts(self, template):
+        """
+        Returns the static prefix and suffix of the template definition, ie. the text before the
+        first key or optional section and the text after the last one.
+        """
+        if template.name not in self._static_parts:
+            definition = template.definition
+            prefix = re.split(r"[\[{]", definition, 1)[0]
+            suffix = re.split(r"[\]}]", definition)[-1] if re.search(r"[\]}]", definition) else ""
+
+            root_path = getattr(template, "root_path", None)
+            if root_path and isinstance(template, tank.template.TemplatePath):
+                prefix = root_path.rstrip("\\/") + "/" + prefix.lstrip("\\/")
+
+            self._static_parts[template.name] = (self._normalize(prefix), self._normalize(suffix))
+
+        return self._static_parts[template.name]
+
+    def _get_candidates(self, path):
+        """
+        Returns the indexed templates whose static parts match the path.
+        """
+        normalized_path = self._normalize(path)
+        extension = self._get_extension(normalized_path)
+
+        candidates = list()
+        for bucket_key in set([extension, None]):
+            prefixes = self._buckets.get(bucket_key)
+            if not prefixes:
+                continue
+            for length in self._prefix_lengths[bucket_key]:
+                for template in prefixes.get(normalized_path[:length], ()):
+                    if normalized_path.endswith(self._get_static_parts(template)[1]):
+                        candidates.append(template)
+
+        return candidates
+
+    def get_matching_templates(self, path):
+        """
+        Returns the indexed templates that can parse the path.
+
+        :param path: path to match
+        :return: list of Template objects
+        """
+        return [template for template in self._get_candidates(path)
+                if self.get_fields(template, path) is not None]
+
+    def get_fields(self, template, path):
+        """
+        Returns the fields of the path parsed with the template, from the cache if available.
+
+        :param template: Template object
+        :param path: path to parse
+        :return: dictionary of fields, or None if the path doesn't match the template
+        """
+        cache_key = (template.name, path)
+
+        if cache_key not in self._fields_cache:
+            normalized_path = self._normalize(path)
+            prefix, suffix = self._get_static_parts(template)
+            if not normalized_path.startswith(prefix) or not normalized_path.endswith(suffix):
+                fields = None
+            else:
+                try:
+                    fields = template.get_fields(path)
+                except Exception:
+                    fields = None
+            self._fields_cache[cache_key] = fields
+
+        fields = self._fields_cache[cache_key]
+        return dict(fields) if fields is not None else None
+
+
 class IngestCollectorPlugin(HookBaseClass):
     """
     Collector that operates on the current set of ingestion files. Should
@@ -84,6 +299,37 @@ class IngestCollectorPlugin(HookBaseClass):
 
     """
 
+    def __init__(self, parent, **kwargs):
+        """
+        Construction
+        """
+        # call base init
+        super(IngestCollectorPlugin, self).__init__(parent, **kwargs)
+
+        # Tag entities that have already been queried/created, keyed by lower case tag name,
+        # since Shotgun matches tag names case insensitively.
+        # This is kept for the lifetime of the collector, ie. the publisher session.
+        self._tag_cache = dict()
+
+        # Step entities keyed by (short_name, entity_type)
+        self._step_cache = dict()
+
+        # Task entities keyed by (entity_type, entity_id, step_id, content)
+        self._task_cache = dict()
+        # locks guarding the creation of each Task, keyed like the task cache
+        self._task_locks = dict()
+
+        # Task status updates waiting to be sent in a single batch, keyed by task id
+        self._pending_task_updates = dict()
+
+        # path to template matching, shared by all the files collected in this session,
+        # see _get_template_match_index
+        self._template_match_index = None
+
+        # values derived from the collector settings, see _get_settings_cache
+        self._settings_cache_owner = None
+        self._settings_cache = dict()
+
     @property
     def settings_schema(self):
         """
@@ -201,6 +447,16 @@ class IngestCollectorPlugin(HookBaseClass):
             "default_value": "contents.yaml",
             "description": "Name of the file to look for, as a source for processing files to be ingested."
         }
+        schema["Collection Threads"] = {
+            "type": "int",
+            "allows_empty": True,
+            "default_value": 4,
+            "description": (
+                "Number of threads used to resolve the templates, contexts, Steps and Tasks of the files in a "
+                "manifest, ahead of item creation. Items are always created on the main thread in manifest order. "
+                "Use 1 to disable threading."
+            )
+        }
         schema["Properties To Display"] = {
             "type": "list",
             "values": {
@@ -410,26 +666,14 @@ class IngestCollectorPlugin(HookBaseClass):
             else:
                 item_type = "notes.entity.%s" % note_type
 
-                relevant_item_settings = raw_item_settings[item_type]
-                raw_template_name = relevant_item_settings.get("work_path_template")
-                envs = self.parent.sgtk.pipeline_configuration.get_environments()
-
-                template_names_per_env = [
-                    sgtk.platform.resolve_setting_expression(raw_template_name,
-                                                             self.parent.engine.instance_name,
-                                                             env_name) for env_name in envs
-                ]
+                raw_template_name = raw_item_settings[item_type].get("work_path_template")
 
-                templates_per_env = [self.parent.get_template_by_name(template_name) for template_name in
-                                     template_names_per_env if self.parent.get_template_by_name(template_name)]
+                templates_per_env = self._get_note_templates(settings, item_type)
+                template_index = self._get_template_match_index()
                 for template in templates_per_env:
-                    try:
-                        template.get_fields(path)
+                    if template_index.get_fields(template, path) is not None:
                         # we have a match!
                         work_path_template = template.name
-                    except:
-                        # it errored out
-                        continue
 
                 if work_path_template:
                     # calculate the context and give to the item
@@ -484,6 +728,9 @@ class IngestCollectorPlugin(HookBaseClass):
                 if item:
                     file_items.append(item)
 
+        # send out the task updates queued up while resolving the item contexts
+        self._flush_task_updates()
+
         return file_items
 
     def _get_item_type_info(self, settings, item_type):
@@ -584,14 +831,40 @@ class IngestCollectorPlugin(HookBaseClass):
 
         return fields
 
-    def _process_manifest_file(self, settings, path):
+    def _load_manifest_file(self, path):
         """
-        Do the required processing on the yaml file, sanitisation or validations.
-        conversions mentioned in Manifest Types setting of the collector hook.
+        Read the yaml file using the fastest available safe loader.
+        The whole document is loaded, since the notes refer to the snapshots and versions by index.
 
         :param path: path to yaml file
-        :return: list of processed snapshots, in the format
-        [{file(type of collect method to run):
+        :return: tuple of (snapshots, notes, versions) lists, or None if the file couldn't be read.
+        """
+        with open(path, 'r') as f:
+            try:
+                contents = yaml.load(f, Loader=ManifestYamlLoader)
+                snapshots = contents["snapshots"]
+                notes = contents.get("notes", list())
+                versions = contents.get("versions", list())
+            except Exception:
+                self.logger.error(
+                    "Failed to read the manifest file %s" % path,
+                    extra={
+                        "action_show_more_info": {
+                            "label": "Show Error Log",
+                            "tooltip": "Show the error log",
+                            "text": traceback.format_exc()
+                        }
+                    }
+                )
+                return None
+
+        return snapshots, notes, versions
+
+    def _iter_manifest_entities(self, settings, path, snapshots, notes, versions):
+        """
+        Generator over the processed snapshots and notes of a manifest file, replacing the fields with
+        the Manifest SG Mappings. Records are processed one at a time, as they are consumed, in the format
+        {file(type of collect method to run):
             {'fields': {'context_type': 'maya_model',
                         'department': 'model',
                         'description': 'n/a',
@@ -608,10 +881,14 @@ class IngestCollectorPlugin(HookBaseClass):
                        '/dd/home/gverma/work/SHARED/MODEL/enviro/egypt_riser_a/hi/maya_model/egypt_riser_a_hi_transform_v001.xml': ['transform_xml'],
                        '/dd/home/gverma/work/SHARED/MODEL/enviro/egypt_riser_a/hi/maya_model/egypt_riser_a_hi_v001.mb': ['main', 'mayaBinary']}
             }
-        }]
-        """
+        }
 
-        processed_snapshots = list()
+        :param dict settings: Configured settings for this collector
+        :param path: path to yaml file
+        :param snapshots: list of snapshots read from the manifest
+        :param notes: list of notes read from the manifest
+        :param versions: list of versions read from the manifest
+        """
         manifest_mappings = settings["Manifest SG Mappings"].value
 
         # since we only process snapshots in this manifest.
@@ -623,32 +900,8 @@ class IngestCollectorPlugin(HookBaseClass):
         # yaml file stays at the base of the package
         base_dir = os.path.dirname(path)
 
-        snapshots = list()
-        notes = list()
-        versions = list()
         notes_index = 0
 
-        with open(path, 'r') as f:
-            try:
-                contents = yaml.load(f)
-                snapshots = contents["snapshots"]
-                if "notes" in contents:
-                    notes = contents["notes"]
-                if "versions" in contents:
-                    versions = contents["versions"]
-            except Exception:
-                self.logger.error(
-                    "Failed to read the manifest file %s" % path,
-                    extra={
-                        "action_show_more_info": {
-                            "label": "Show Error Log",
-                            "tooltip": "Show the error log",
-                            "text": traceback.format_exc()
-                        }
-                    }
-                )
-                return processed_snapshots
-
         for snapshot in snapshots:
             # first replace all the snapshot with the Manifest SG Mappings
             data = dict()
@@ -680,7 +933,7 @@ class IngestCollectorPlugin(HookBaseClass):
                             data["files"][append_path] = list()
                         data["files"][append_path].append(file_type)
 
-            processed_snapshots.append({"file": data})
+            yield {"file": data}
 
         for note in notes:
             # first replace all the snapshot with the Manifest SG Mappings
@@ -751,12 +1004,67 @@ class IngestCollectorPlugin(HookBaseClass):
             for attachment in attachments:
                 data["fields"]["attachments"].append(os.path.join(base_dir, attachment["path"]))
 
-            processed_snapshots.append({"note": data})
+            yield {"note": data}
 
             # move to the next snapshot
             notes_index += 1
 
-        return processed_snapshots
+    def _resolve_tags(self, tags):
+        """
+        Queries/Creates tag entities for all the tag names that are not cached yet.
+
+        Existing tags are fetched using a single query, and the missing ones are
+        created using a single batch request. The results are stored in the tag cache.
+
+        :param tags: List of tag names.
+        """
+        # tag names differing only by case are the same tag, the first spelling is used for creation
+        missing_tags = dict()
+        for tag_name in tags:
+            tag_key = tag_name.lower()
+            if tag_key not in self._tag_cache:
+                missing_tags.setdefault(tag_key, tag_name)
+        if not missing_tags:
+            return
+
+        fields = ["name", "id", "code", "type"]
+        tag_entities = self.sgtk.shotgun.find(entity_type="Tag",
+                                              filters=[["name", "in", sorted(missing_tags.values())]],
+                                              fields=fields)
+        for tag_entity in tag_entities:
+            self._tag_cache.setdefault(tag_entity["name"].lower(), tag_entity)
+
+        tags_to_create = [missing_tags[tag_key] for tag_key in sorted(missing_tags)
+                          if tag_key not in self._tag_cache]
+        if not tags_to_create:
+            return
+
+        batch_data = [
+            {
+                "request_type": "create",
+                "entity_type": "Tag",
+                "data": dict(name=tag_name),
+                "return_fields": fields
+            } for tag_name in tags_to_create
+        ]
+
+        try:
+            new_entities = self.sgtk.shotgun.batch(batch_data)
+        except Exception:
+            self.logger.error(
+                "Failed to create Tags: %s" % ", ".join(tags_to_create),
+                extra={
+                    "action_show_more_info": {
+                        "label": "Show Error log",
+                        "tooltip": "Show the error log",
+                        "text": traceback.format_exc()
+                    }
+                }
+            )
+            return
+
+        for new_entity in new_entities:
+            self._tag_cache[new_entity["name"].lower()] = new_entity
 
     def _query_associated_tags(self, tags):
         """
@@ -765,31 +1073,81 @@ class IngestCollectorPlugin(HookBaseClass):
         :param tags: List of tag names.
         :return: List of created/existing tag entities.
         """
+        self._resolve_tags(tags)
 
         tag_entities = list()
-
-        fields = ["name", "id", "code", "type"]
         for tag_name in tags:
-            tag_entity = self.sgtk.shotgun.find_one(entity_type="Tag", filters=[["name", "is", tag_name]], fields=fields)
-            if tag_entity:
+            tag_entity = self._tag_cache.get(tag_name.lower())
+            if tag_entity and tag_entity not in tag_entities:
                 tag_entities.append(tag_entity)
-            else:
-                try:
-                    new_entity = self.sgtk.shotgun.create(entity_type="Tag", data=dict(name=tag_name))
-                    tag_entities.append(new_entity)
-                except Exception:
-                    self.logger.error(
-                        "Failed to create Tag: %s" % tag_name,
-                        extra={
-                            "action_show_more_info": {
-                                "label": "Show Error log",
-                                "tooltip": "Show the error log",
-                                "text": traceback.format_exc()
-                            }
-                        }
-                    )
+
         return tag_entities
 
+    def _prefetch_file_context(self, parent_item, path):
+        """
+        Resolves the template and the context of a manifest file ahead of its item creation, so that the
+        template parsing and the Step and Task lookups are served from the caches when the item is created.
+
+        This is run from the collection threads, self.sgtk.shotgun is a connection dedicated to the thread.
+
+        :param parent_item: parent item instance
+        :param path: Path of the file
+        """
+        try:
+            if os.path.isdir(path):
+                return
+
+            _, matching_templates = self._get_matching_templates(path)
+            if len(matching_templates) == 1:
+                self._get_item_context_from_path(matching_templates[0].name, path, parent_item)
+        except Exception:
+            # the item creation runs the same lookups again, and reports the errors
+            pass
+
+    def _prefetch_manifest_entities(self, parent_item, entities, thread_count):
+        """
+        Generator that runs _prefetch_file_context over the files of the processed manifest entities,
+        using a pool of threads that works on the next chunk of entities while the current one is consumed.
+        Entities are yielded back in manifest order.
+
+        :param parent_item: parent item instance
+        :param entities: iterable of processed manifest entities, see _iter_manifest_entities
+        :param thread_count: Number of threads to use, nothing is prefetched if this is less than 2
+        :return: generator of processed manifest entities
+        """
+        if not thread_count or thread_count < 2:
+            for entity in entities:
+                yield entity
+            return
+
+        def prefetch(chunk):
+            paths = [p_file for entity in chunk for p_file in entity.get("file", dict()).get("files", dict())]
+            return pool.map_async(lambda p_file: self._prefetch_file_context(parent_item, p_file), paths)
+
+        # build the template index once, before the threads share it
+        self._get_template_match_index()
+
+        entities = iter(entities)
+        chunk_size = thread_count * 4
+        pool = ThreadPool(thread_count)
+
+        try:
+            chunk = list(itertools.islice(entities, chunk_size))
+            result = prefetch(chunk)
+
+            while chunk:
+                next_chunk = list(itertools.islice(entities, chunk_size))
+                result.wait()
+                next_result = prefetch(next_chunk)
+
+                for entity in chunk:
+                    yield entity
+
+                chunk, result = next_chunk, next_result
+        finally:
+            pool.terminate()
+            pool.join()
+
     def _collect_manifest_file(self, settings, parent_item, path):
         """
         Process the supplied manifest file.
@@ -801,13 +1159,30 @@ class IngestCollectorPlugin(HookBaseClass):
         :returns: The item that was created
         """
 
-        # process the manifest file first, replace the fields to relevant names.
+        manifest_contents = self._load_manifest_file(path)
+        if manifest_contents is None:
+            return list()
+
+        snapshots, notes, versions = manifest_contents
+
+        # resolve the tags of all the files in the manifest in one go, the tags of a file are its file_types.
+        # _query_associated_tags will then be served from the tag cache.
+        manifest_tags = set()
+        for snapshot in snapshots:
+            manifest_tags.update(snapshot.get("file_types", dict()).iterkeys())
+        self._resolve_tags(manifest_tags)
+
+        # process the manifest entities as we go, replace the fields to relevant names.
         # collect the tags a file has too.
-        processed_entities = self._process_manifest_file(settings, path)
+        processed_entities = self._iter_manifest_entities(settings, path, snapshots, notes, versions)
 
         file_items = list()
 
-        for entity in processed_entities:
+        # items are created in manifest order, while the next files are resolved on the collection threads.
+        prefetched_entities = self._prefetch_manifest_entities(parent_item, processed_entities,
+                                                               settings["Collection Threads"].value)
+
+        for entity in prefetched_entities:
             for hook_type, item_data in entity.iteritems():
                 files = item_data["files"]
                 # notes can be ingested without attachments as well.
@@ -941,60 +1316,27 @@ class IngestCollectorPlugin(HookBaseClass):
         # which in case of manifest file based ingestion would contain a list of manifest_file_fields
         if "manifest_file_fields" in creation_properties:
             manifest_file_fields = creation_properties["manifest_file_fields"]
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
             for resolution_order, work_path_template, item_type in template_item_type_mapping:
-                type_info = self._get_item_type_info(settings, item_type)
-                manifest_field_filters = type_info["manifest_field_filters"]
+                manifest_field_filters = self._get_manifest_field_filters(settings, item_type)
 
                 if work_path_template and manifest_field_filters:
                     match_score = 0
 
-                    for field, parser_value in manifest_field_filters.iteritems():
-                        field_value = manifest_file_fields.get(field)
-
-                        if field_value:
-                            field_value_match = False
-                            operator_method = "not found"
-                            expected_value = "not found"
-                            expected_result = "not found"
-                            # operator module specific parsing, '%<operator method>:expected_value:expected_result%'
-                            operator_module_match = re.match("%(.*):(.*):(.*)%", parser_value)
-                            # field value operator based parsing,
-                            # '#<value operator method>:expected_value:expected_result#'
-                            field_value_operator_match = re.match("#(.*):(.*):(.*)#", parser_value)
-
-                            if operator_module_match:
-                                operator_method_name = operator_module_match.groups()[0]
-                                expected_value = operator_module_match.groups()[1]
-                                expected_result = operator_module_match.groups()[2]
-
-                                operator_method = getattr(operator, operator_method_name)
-                                # match the value of the manifest field against the expected value
-                                field_value_match = operator_method(field_value, expected_value)
-
-                            if field_value_operator_match:
-                                operator_method_name = field_value_operator_match.groups()[0]
-                                expected_value = field_value_operator_match.groups()[1]
-                                expected_result = field_value_operator_match.groups()[2]
-
-                                operator_method = getattr(field_value, operator_method_name)
-                                # match the value of the manifest field against the expected value
-                                field_value_match = operator_method(expected_value)
-
-                            # if this is not a boolean get the expected result from the info
-                            if not isinstance(field_value_match, bool):
-                                value_type = type(field_value_match)
-                                try:
-                                    field_value_match = (field_value_match == value_type(expected_result))
-                                except:
-                                    field_value_match = False
-
-                            if field_value_match:
-                                # drop the value of resolution order by that much amount
-                                match_score += 1
-
-                            self.logger.info("Manifest field filter info for field %s." % field,
-                                             extra={
+                    for field_filter in manifest_field_filters:
+                        field_value = manifest_file_fields.get(field_filter.field)
+
+                        if not field_value:
+                            continue
+
+                        if field_filter.match(field_value):
+                            # drop the value of resolution order by that much amount
+                            match_score += 1
+
+                        if debug_enabled:
+                            self.logger.debug("Manifest field filter info for field %s." % field_filter.field,
+                                              extra={
                                                   "action_show_more_info": {
                                                       "label": "Show Data",
                                                       "tooltip": "Show the data",
@@ -1002,8 +1344,11 @@ class IngestCollectorPlugin(HookBaseClass):
                                                               "\nOperator Method: %s\nExpected Value: %s"
                                                               "\nMatch Score: %s\nExpected Result: %s"
                                                               "\nPath: %s\nManifest Fields: %s" %
-                                                              (field_value, parser_value, operator_method,
-                                                               expected_value, match_score, expected_result, path,
+                                                              (field_value, field_filter.parser_value,
+                                                               field_filter.operator_method or
+                                                               field_filter.value_operator_method_name,
+                                                               field_filter.expected_value, match_score,
+                                                               field_filter.expected_result, path,
                                                                pprint.pformat(manifest_file_fields))
                                                   }
                                               })
@@ -1011,7 +1356,7 @@ class IngestCollectorPlugin(HookBaseClass):
                     # if all the conditions match, only then we need to update the resolution order
                     # else drop the priority of this item type to last so a normal item type will get picked, this is
                     # to maintain backwards compatibility.
-                    if match_score == len(manifest_field_filters.keys()):
+                    if match_score == len(manifest_field_filters):
                         found_matching_manifest_filter = True
                         # TODO: See if this needs to be changed to use highest resolution oreder instead of items'
                         resolution_order = resolution_order - match_score
@@ -1024,8 +1369,7 @@ class IngestCollectorPlugin(HookBaseClass):
         # will be removed from the mapping list, if they don't have a matching work_path_template.
         else:
             for resolution_order, work_path_template, item_type in template_item_type_mapping:
-                type_info = self._get_item_type_info(settings, item_type)
-                if not type_info["manifest_field_filters"]:
+                if not self._get_manifest_field_filters(settings, item_type):
                     filtered_template_item_type_mapping.append((resolution_order, work_path_template, item_type))
 
         # sort the list on resolution_order, giving preference to a matching template
@@ -1034,6 +1378,79 @@ class IngestCollectorPlugin(HookBaseClass):
 
         return filtered_template_item_type_mapping
 
+    def _get_settings_cache(self, settings):
+        """
+        Returns a dictionary to store values computed from the collector settings.
+        The dictionary is reset whenever the collector runs with a different settings object.
+
+        :param dict settings: Configured settings for this collector
+        :return: Cache dictionary for the settings
+        """
+        if self._settings_cache_owner is not settings:
+            self._settings_cache_owner = settings
+            self._settings_cache = dict()
+
+        return self._settings_cache
+
+    def _get_note_templates(self, settings, item_type):
+        """
+        Returns the work_path_template of a note item type, resolved for every environment.
+        The templates are resolved once per collector settings and reused for every note.
+
+        :param dict settings: Configured settings for this collector
+        :param item_type: The note item type, eg. notes.entity.annotation
+        :return: List of Template objects
+        """
+        note_templates = self._get_settings_cache(settings).setdefault("note_templates", dict())
+
+        if item_type not in note_templates:
+            raw_item_settings = settings["Item Types"].raw_value
+            raw_template_name = raw_item_settings[item_type].get("work_path_template")
+            envs = self.parent.sgtk.pipeline_configuration.get_environments()
+
+            template_names_per_env = [
+                sgtk.platform.resolve_setting_expression(raw_template_name,
+                                                         self.parent.engine.instance_name,
+                                                         env_name) for env_name in envs
+            ]
+
+            # environments mostly resolve to the same template, only keep the last occurrence of each
+            # since the last matching template wins in _add_note_item.
+            unique_template_names = list()
+            for template_name in reversed(template_names_per_env):
+                if template_name not in unique_template_names:
+                    unique_template_names.insert(0, template_name)
+
+            templates_per_env = list()
+            for template_name in unique_template_names:
+                template = self.parent.get_template_by_name(template_name)
+                if template:
+                    templates_per_env.append(template)
+
+            note_templates[item_type] = templates_per_env
+
+        return note_templates[item_type]
+
+    def _get_manifest_field_filters(self, settings, item_type):
+        """
+        Returns the compiled manifest_field_filters of an item type.
+        The filters are compiled once per collector settings and reused for every file.
+
+        :param dict settings: Configured settings for this collector
+        :param item_type: The type of Item to get the filters for
+        :return: List of :class:`ManifestFieldFilter`
+        """
+        manifest_field_filters = self._get_settings_cache(settings).setdefault("manifest_field_filters", dict())
+
+        if item_type not in manifest_field_filters:
+            type_info = self._get_item_type_info(settings, item_type)
+            manifest_field_filters[item_type] = [
+                ManifestFieldFilter(field, parser_value)
+                for field, parser_value in type_info["manifest_field_filters"].iteritems()
+            ]
+
+        return manifest_field_filters[item_type]
+
     def _get_item_context_from_path(self, work_path_template, path, parent_item, default_entities=list()):
         """Updates the context of the item from the work_path_template/template, if needed.
 
@@ -1057,21 +1474,8 @@ class IngestCollectorPlugin(HookBaseClass):
             # if the context already has a valid step use that.
             # we extract the step from the work_path_template, in case of notes.
             if not context.step:
-                step_filters = list()
-                step_filters.append(['short_name', 'is', "vendor"])
-
-                # make sure we get the correct Step!
-                # this should handle whether the Step is from Sequence/Shot/Asset
-                step_filters.append(["entity_type", "is", context.entity["type"]])
-
-                fields = ['entity_type', 'code', 'id', 'name']
-
                 # add a vendor step to all ingested files
-                step_entity = self.sgtk.shotgun.find_one(
-                    entity_type='Step',
-                    filters=step_filters,
-                    fields=fields
-                )
+                step_entity = self._get_step_entity("vendor", context.entity["type"])
             else:
                 step_entity = context.step
 
@@ -1080,74 +1484,198 @@ class IngestCollectorPlugin(HookBaseClass):
                 # FIXME: step entity in context has "name" and entity queried from shotgun has "code"
                 content = step_entity["name"] if step_entity.get("name") else step_entity["code"]
 
-                task_filters = [
-                    ['step', 'is', step_entity],
-                    ['entity', 'is', context.entity],
-                    ['project', 'is', context.project],
-                    ['content', 'is', content]
-                ]
+                task_entity = self._get_task_entity(context, step_entity, content, path)
+                if task_entity:
+                    default_entities.append(task_entity)
 
-                task_fields = ['content', 'entity_type', 'id']
+                context = super(IngestCollectorPlugin, self)._get_item_context_from_path(work_path_template,
+                                                                              path,
+                                                                              parent_item,
+                                                                              default_entities)
 
-                task_entity = self.sgtk.shotgun.find_one(
-                    entity_type='Task',
-                    filters=task_filters,
-                    fields=task_fields
-                )
+        return context
+
+    def _get_step_entity(self, short_name, entity_type):
+        """
+        Returns the Step entity for the given short_name and entity_type, using the step cache.
+
+        :param short_name: short_name of the Step
+        :param entity_type: Entity type the Step belongs to, this should handle whether the Step is
+        from Sequence/Shot/Asset
+        :return: Step entity or None
+        """
+        cache_key = (short_name, entity_type)
+
+        if cache_key not in self._step_cache:
+            step_filters = [
+                ['short_name', 'is', short_name],
+                ["entity_type", "is", entity_type]
+            ]
+
+            fields = ['entity_type', 'code', 'id', 'name']
+
+            self._step_cache[cache_key] = self.sgtk.shotgun.find_one(
+                entity_type='Step',
+                filters=step_filters,
+                fields=fields
+            )
+
+        return self._step_cache[cache_key]
+
+    def _get_task_entity(self, context, step_entity, content, path):
+        """
+        Returns the ingestion Task for the context entity and step, using the task cache.
+        The Task is created if it doesn't exist yet, and a status update to "na" is queued
+        if the existing Task has a different status.
+
+        :param context: The :class:`sgtk.Context` resolved from the path
+        :param step_entity: The Step entity of the Task
+        :param content: The content of the Task
+        :param path: Path the context was resolved from
+        :return: Task entity or None
+        """
+        cache_key = (context.entity["type"], context.entity["id"], step_entity["id"], content)
+
+        if cache_key in self._task_cache:
+            return self._task_cache[cache_key]
+
+        # the collection threads may look up the same Task concurrently, only create it once.
+        with self._task_locks.setdefault(cache_key, threading.Lock()):
+            if cache_key in self._task_cache:
+                return self._task_cache[cache_key]
+
+            task_filters = [
+                ['step', 'is', step_entity],
+                ['entity', 'is', context.entity],
+                ['project', 'is', context.project],
+                ['content', 'is', content]
+            ]
+
+            task_fields = ['content', 'entity_type', 'id', 'sg_status_list']
 
-                # create the task:
+            task_entity = self.sgtk.shotgun.find_one(
+                entity_type='Task',
+                filters=task_filters,
+                fields=task_fields
+            )
+
+            # create the task:
+            if not task_entity:
+
+                data = {
+                    "step": step_entity,
+                    "project": context.project,
+                    "entity": context.entity,
+                    "content": content,
+                    "sg_status_list": "na"
+                }
+
+                task_entity = self.sgtk.shotgun.create("Task", data, return_fields=task_fields)
                 if not task_entity:
+                    self.logger.error("Failed to create Ingestion Task.",
+                                      extra={
+                                          "action_show_more_info": {
+                                              "label": "Show Data",
+                                              "tooltip": "Show the error log",
+                                              "text": "Data: %s\nPath: %s" % (pprint.pformat(data),
+                                                                              path)
+                                          }
+                                      })
+                    return None
+
+            elif task_entity.get("sg_status_list") != "na":
+                # set the status of the task entity to na, along with the other pending updates
+                self._pending_task_updates[task_entity["id"]] = {"sg_status_list": "na"}
+                task_entity["sg_status_list"] = "na"
+
+            self._task_cache[cache_key] = task_entity
+            return task_entity
+
+    def _flush_task_updates(self):
+        """
+        Sends all the queued Task updates to shotgun using a single batch request.
+        """
+        if not self._pending_task_updates:
+            return
 
-                    data = {
-                        "step": step_entity,
-                        "project": context.project,
-                        "entity": context.entity,
-                        "content": content,
-                        "sg_status_list": "na"
+        batch_data = [
+            {
+                "request_type": "update",
+                "entity_type": "Task",
+                "entity_id": task_id,
+                "data": data
+            } for task_id, data in self._pending_task_updates.iteritems()
+        ]
+        self._pending_task_updates = dict()
+
+        try:
+            self.sgtk.shotgun.batch(batch_data)
+        except Exception:
+            self.logger.warning(
+                "Failed to update the status of %d ingestion Task(s)." % len(batch_data),
+                extra={
+                    "action_show_more_info": {
+                        "label": "Show Error log",
+                        "tooltip": "Show the error log",
+                        "text": traceback.format_exc()
                     }
+                }
+            )
+
+    def _get_template_match_index(self):
+        """
+        Returns the index used to match paths against the templates of the pipeline configuration.
+        The index is built once and reused for every file collected in this session.
 
-                    task_entity = self.sgtk.shotgun.create("Task", data, return_fields=task_fields)
-                    if not task_entity:
-                        self.logger.error("Failed to create Ingestion Task.",
-                                          extra={
-                                              "action_show_more_info": {
-                                                  "label": "Show Data",
-                                                  "tooltip": "Show the error log",
-                                                  "text": "Data: %s\nPath: %s" % (pprint.pformat(data),
-                                                                                  path)
-                                              }
-                                          })
+        :return: :class:`TemplateMatchIndex`
+        """
+        if self._template_match_index is None:
+            self._template_match_index = TemplateMatchIndex(self.parent.sgtk.templates.values())
 
-                if task_entity:
-                    # try to set the status of the task entity to na
-                    try:
-                        self.sgtk.shotgun.update("Task", task_entity["id"], {"sg_status_list": "na"})
-                    except:
-                        pass
+        return self._template_match_index
 
-                    default_entities.append(task_entity)
+    def _get_matching_templates(self, path):
+        """
+        Returns the templates matching the file name of the path, or the full path if none matches the file name.
 
-                context = super(IngestCollectorPlugin, self)._get_item_context_from_path(work_path_template,
-                                                                              path,
-                                                                              parent_item,
-                                                                              default_entities)
+        :param path: Path to match
+        :return: tuple of (the matched file name or path, list of Template objects)
+        """
+        file_name = os.path.basename(path)
 
-        return context
+        for match_path in sorted(set([file_name, path]), key=len):
+            matching_templates = self._get_template_match_index().get_matching_templates(match_path)
+            if matching_templates:
+                return match_path, matching_templates
+
+        return path, list()
 
     def _get_work_path_template_from_settings(self, settings, item_type, path):
         """
         Helper method to get the work_path_template from the collector settings object.
         """
+        item_info = self._get_item_type_info(settings, item_type)
+        file_name = os.path.basename(path)
+
+        # resolve paths against the template index, unless a template is explicitly configured
+        # or the path is ambiguous, which are both handled by the base collector.
+        if not item_info.get("work_path_template"):
+            match_path, matching_templates = self._get_matching_templates(path)
+            if len(matching_templates) > 1:
+                return super(IngestCollectorPlugin, self)._get_work_path_template_from_settings(settings,
+                                                                                               item_type,
+                                                                                               match_path)
+            return matching_templates[0].name if matching_templates else None
+
         # first try with filename
         work_path_template = super(IngestCollectorPlugin, self)._get_work_path_template_from_settings(settings,
                                                                                                       item_type,
-                                                                                                      os.path.basename(path))
-        if work_path_template:
-            return work_path_template
+                                                                                                      file_name)
+        if not work_path_template and file_name != path:
+            work_path_template = super(IngestCollectorPlugin, self)._get_work_path_template_from_settings(
+                settings, item_type, path)
 
-        return super(IngestCollectorPlugin, self)._get_work_path_template_from_settings(settings,
-                                                                                        item_type,
-                                                                                        path)
+        return work_path_template
 
     def _get_template_fields_from_path(self, item, template_name, path):
         """
@@ -1163,9 +1691,12 @@ class IngestCollectorPlugin(HookBaseClass):
                 # use file name if the path was parsed using TemplateString
                 path = os.path.basename(path)
 
-        fields = super(IngestCollectorPlugin, self)._get_template_fields_from_path(item,
-                                                                                   template_name,
-                                                                                   path)
+        template = self.parent.get_template_by_name(template_name)
+        fields = self._get_template_match_index().get_fields(template, path) if template else None
+        if fields is None:
+            # let the base collector handle missing templates and paths that don't match
+            fields = super(IngestCollectorPlugin, self)._get_template_fields_from_path(item, template_name, path)
+
         # adding a description to item
         item.description = "Created by shotgun_ingest on %s" % str(datetime.date.today())
         return fields
@@ -9,11 +9,14 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import re
 import copy
-import glob
+import fnmatch
 import pprint
 import traceback
 
+from multiprocessing.pool import ThreadPool
+
 import sgtk
 from sgtk import TankError
 
@@ -84,6 +87,13 @@ class ColorProcessFilesPlugin(HookBaseClass):
             "description": "Name of the Review Submit App, to be used by the plugin."
         }
 
+        schema["Seal Threads"] = {
+            "type": "int",
+            "allows_empty": True,
+            "default_value": 8,
+            "description": "Number of threads used to freeze permissions and seal the published frames."
+        }
+
         return schema
 
     def accept(self, task_settings, item):
@@ -182,33 +192,7 @@ class ColorProcessFilesPlugin(HookBaseClass):
         )
 
         # try to freeze file permissions
-        if item.properties.is_sequence:
-            seq_pattern = publisher.util.get_path_for_frame(publish_path, "*")
-            published_files = [f for f in glob.iglob(seq_pattern) if os.path.isfile(f)]
-        else:
-            published_files = [publish_path]
-
-        for published_file in published_files:
-            try:
-                sgtk.util.filesystem.freeze_permissions(published_file)
-            except OSError:
-                self.logger.warning(
-                    "Unable to make file '{}' read-only.".format(published_file),
-                    extra={
-                        "action_show_more_info": {
-                            "label": "Show Error Log",
-                            "tooltip": "Show the error log",
-                            "text": traceback.format_exc()
-                        }
-                    }
-                )
-
-            try:
-                sgtk.util.filesystem.seal_file(published_file)
-            except Exception as e:
-                # primary function is to copy. Do not raise exception if sealing fails.
-                self.logger.warning("File '%s' could not be sealed, skipping: %s" % (published_file, e))
-                self.logger.warning(traceback.format_exc())
+        self._seal_published_files(task_settings, item, publish_path)
 
         exception = None
         # create the publish and stash it in the item properties for other
@@ -465,6 +449,113 @@ class ColorProcessFilesPlugin(HookBaseClass):
             # pop the sg_publish_data_list too
             item.properties.pop("sg_publish_data_list")
 
+    def _list_published_files(self, item, publish_path):
+        """
+        List the files published at the publish path, all the frames in case of a sequence.
+
+        :param item: Item to process
+        :param publish_path: The publish path, with a frame pattern in case of a sequence
+        :return: list of file paths
+        """
+        if not item.properties.is_sequence:
+            return [publish_path]
+
+        seq_pattern = self.parent.util.get_path_for_frame(publish_path, "*")
+        seq_dir, seq_file_pattern = os.path.split(seq_pattern)
+        seq_file_regex = re.compile(fnmatch.translate(seq_file_pattern))
+
+        scandir = getattr(os, "scandir", None)
+        published_files = list()
+
+        try:
+            if scandir:
+                # a single listing of the directory, the entries know whether they are files
+                for entry in scandir(seq_dir):
+                    if seq_file_regex.match(entry.name) and entry.is_file():
+                        published_files.append(entry.path)
+            else:
+                published_files = [os.path.join(seq_dir, file_name) for file_name in os.listdir(seq_dir)
+                                   if seq_file_regex.match(file_name)]
+        except OSError:
+            self.logger.warning("Unable to list the published frames in '%s'." % seq_dir)
+
+        return sorted(published_files)
+
+    def _seal_published_file(self, published_file):
+        """
+        Freeze the permissions of a published file and seal it.
+
+        :param published_file: path to the published file
+        :return: list of error messages, empty if successful
+        """
+        errors = list()
+
+        if not os.path.isfile(published_file):
+            return errors
+
+        try:
+            sgtk.util.filesystem.freeze_permissions(published_file)
+        except OSError as e:
+            errors.append("Unable to make file '%s' read-only: %s" % (published_file, e))
+
+        try:
+            sgtk.util.filesystem.seal_file(published_file)
+        except Exception as e:
+            # primary function is to copy. Do not raise exception if sealing fails.
+            errors.append("File '%s' could not be sealed, skipping: %s" % (published_file, e))
+
+        return errors
+
+    def _seal_published_files(self, task_settings, item, publish_path):
+        """
+        Freeze the permissions of the published files and seal them, using a pool of threads.
+        Failures don't stop the publish, they are reported in a single warning.
+
+        :param task_settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the task_settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        :param publish_path: The publish path, with a frame pattern in case of a sequence
+        """
+        published_files = self._list_published_files(item, publish_path)
+        if not published_files:
+            return
+
+        thread_count = max(1, min(task_settings["Seal Threads"].value or 1, len(published_files)))
+        stage = {"item": {"name": item.name}, "output": {"name": os.path.basename(publish_path)}}
+
+        self._progress_cb("Sealing %d published file(s)..." % len(published_files), stage)
+
+        errors = list()
+        failed_count = 0
+        pool = ThreadPool(thread_count)
+        try:
+            for index, file_errors in enumerate(pool.imap(self._seal_published_file, published_files,
+                                                          chunksize=16), 1):
+                if file_errors:
+                    failed_count += 1
+                    errors.extend(file_errors)
+                if index % 100 == 0:
+                    self._progress_cb("Sealed %d/%d published file(s)" % (index, len(published_files)), stage)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        self._progress_cb("Sealed %d published file(s)" % len(published_files), stage)
+
+        if errors:
+            self.logger.warning(
+                "Unable to freeze/seal %d out of %d published file(s) for %s." %
+                (failed_count, len(published_files), item.name),
+                extra={
+                    "action_show_more_info": {
+                        "label": "Show Errors",
+                        "tooltip": "Show the files that couldn't be frozen/sealed",
+                        "text": "\n".join(errors)
+                    }
+                }
+            )
+
     def _progress_cb(self, msg=None, stage=None):
         """
         """
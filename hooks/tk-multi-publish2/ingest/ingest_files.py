@@ -25,6 +25,20 @@ class IngestFilesPlugin(HookBaseClass):
     Inherits from PublishFilesPlugin
     """
 
+    def __init__(self, parent, **kwargs):
+        """
+        Construction
+        """
+        # call base init
+        super(IngestFilesPlugin, self).__init__(parent, **kwargs)
+
+        # (task_settings, item) whose PublishedFiles are yet to be linked to their linked entity,
+        # these are sent in a single batch before any other plugin gets to publish.
+        self._pending_linked_entity_items = list()
+        # ids of the items whose task is the last of a run of consecutive tasks of this plugin,
+        # None until the publish starts. See _get_batch_end_item_ids
+        self._batch_end_item_ids = None
+
     @property
     def settings_schema(self):
         """
@@ -125,6 +139,10 @@ class IngestFilesPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
 
+        # validation always runs before publish, drop anything left over from an interrupted publish.
+        self._pending_linked_entity_items = list()
+        self._batch_end_item_ids = None
+
         # this has to run first so that item properties are populated.
         # This also makes sure we are running within a valid context.
         # Properties are used to find a linked entity.
@@ -194,6 +212,30 @@ class IngestFilesPlugin(HookBaseClass):
         """
         Executes the publish logic for the given item and task_settings.
 
+        :param task_settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the task_settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        if self._batch_end_item_ids is None:
+            self._batch_end_item_ids = self._get_batch_end_item_ids(item)
+
+        try:
+            self._publish_item(task_settings, item)
+        except Exception:
+            # the publish stops here, link the items published so far before bailing out
+            self._flush_linked_entity_updates()
+            raise
+
+        if not self._batch_end_item_ids or id(item) in self._batch_end_item_ids:
+            # the next task belongs to another plugin, which may fail and stop the publish,
+            # link the publish files of the items published so far together.
+            self._flush_linked_entity_updates()
+
+    def _publish_item(self, task_settings, item):
+        """
+        Creates the linked entity and the PublishedFiles of an item, and queues the link between them.
+
         :param task_settings: Dictionary of Settings. The keys are strings, matching
             the keys returned in the task_settings property. The values are `Setting`
             instances.
@@ -213,21 +255,9 @@ class IngestFilesPlugin(HookBaseClass):
             self.create_published_files(task_settings, item)
 
             if item.properties.get("sg_publish_data_list"):
-                # link the publish file to our linked entity.
-                updated_linked_entity = self._link_published_files_to_entity(task_settings, item)
-
-                if updated_linked_entity:
-                    # clear the status list of the linked_entity
-                    self._clear_linked_entity_status_list(task_settings, item)
-                    self.logger.info("%s entity registered and PublishedFile linked for %s" %
-                                     (item.properties["linked_entity_type"], item.name))
-                else:
-                    # undo the linked_entity creation
-                    self.undo(task_settings, item)
-                    # undo the parent publish
-                    super(IngestFilesPlugin, self).undo(task_settings, item)
-                    self.logger.error("Failed to link the PublishedFile and the %s entity for %s!" %
-                                      (item.properties["linked_entity_type"], item.name))
+                # queue the link of the publish file to our linked entity, the links of consecutive
+                # items are sent together.
+                self._pending_linked_entity_items.append((task_settings, item))
             else:
                 # undo the linked_entity creation
                 self.undo(task_settings, item)
@@ -245,6 +275,39 @@ class IngestFilesPlugin(HookBaseClass):
             self.logger.error("Failed to create a %s entity for %s!" %
                               (item.properties["linked_entity_type"], item.name))
 
+    def _get_batch_end_item_ids(self, item):
+        """
+        Returns the ids of the items whose task of this plugin is followed by a task of another
+        plugin, or by no task at all, in the publish order of the tree.
+
+        :param item: Any item of the publish tree
+        :return: set of item ids, empty if the tree can't be inspected so that items are linked one by one
+        """
+        root_item = item
+        while root_item.parent:
+            root_item = root_item.parent
+
+        item_ids = set()
+        last_item = None
+        try:
+            # tasks are published in tree order, then in the order of the tasks of each item
+            for tree_item in root_item.descendants:
+                for task in tree_item.tasks:
+                    if not task.active:
+                        continue
+                    if task.plugin is self.plugin:
+                        last_item = tree_item
+                    elif last_item is not None:
+                        item_ids.add(id(last_item))
+                        last_item = None
+        except AttributeError:
+            return set()
+
+        if last_item is not None:
+            item_ids.add(id(last_item))
+
+        return item_ids
+
     def finalize(self, task_settings, item):
         """
         Execute the finalization pass. This pass executes once
@@ -257,6 +320,9 @@ class IngestFilesPlugin(HookBaseClass):
         :param item: Item to process
         """
 
+        # nothing should be queued at this point, link anything left over.
+        self._flush_linked_entity_updates()
+
         super(IngestFilesPlugin, self).finalize(task_settings, item)
 
         if "ingest_entity_data" in item.properties:
@@ -375,35 +441,6 @@ class IngestFilesPlugin(HookBaseClass):
         else:
             return snapshot_settings["*"]
 
-    def _clear_linked_entity_status_list(self, task_settings, item):
-        """
-        Sets the status list on the linked_entity to None.
-        Once the linked_entity has been completely linked to it's PublishedFile entity.
-
-        :param task_settings: Dictionary of Settings. The keys are strings, matching
-            the keys returned in the task_settings property. The values are `Setting`
-            instances.
-        :param item:  item to get the linked entity from
-        """
-        if "ingest_entity_data" in item.properties:
-            try:
-                self.sgtk.shotgun.update(
-                    entity_type=item.properties["ingest_entity_data"]["type"],
-                    entity_id=item.properties["ingest_entity_data"]["id"],
-                    data={"sg_status_list": None},
-                )
-            except Exception:
-                self.logger.error(
-                    "clear_linked_entity_status_list failed for item: %s" % item.name,
-                    extra={
-                        "action_show_more_info": {
-                            "label": "Show Error Log",
-                            "tooltip": "Show the error log",
-                            "text": traceback.format_exc()
-                        }
-                    }
-                )
-
     def _find_linked_entity(self, task_settings, item, fields=list()):
         """
         Finds a linked entity corresponding to the item's context.
@@ -607,36 +644,37 @@ class IngestFilesPlugin(HookBaseClass):
             )
             raise e
 
-    def _link_published_files_to_entity(self, task_settings, item):
+    def _flush_linked_entity_updates(self):
         """
-        Link the new entity to its corresponding publish files.
+        Links the publish files of all the queued items to their linked entities, and clears the status
+        list of the linked entities, using a single batch request.
 
-        :param task_settings: Dictionary of Settings. The keys are strings, matching
-            the keys returned in the task_settings property. The values are `Setting`
-            instances.
-        :param item: item to get the publish files(sg_publish_data_list) and linked entity(ingest_entity_data)
-        :return: Updated linked entity.
+        The batch is transactional, so if it fails the items are linked one by one to find out the
+        failing ones. The linked entity and the publish of the failing items are undone.
         """
-
-        if "ingest_entity_data" not in item.properties:
+        pending_items = self._pending_linked_entity_items
+        if not pending_items:
             return
 
-        sg_publish_data_list = []
+        self._pending_linked_entity_items = list()
+        items = [item for _, item in pending_items]
 
-        if "sg_publish_data_list" in item.properties:
-            sg_publish_data_list.extend(item.properties.sg_publish_data_list)
+        batch_data = list()
+        for item in items:
+            batch_data.append({
+                "request_type": "update",
+                "entity_type": item.properties["ingest_entity_data"]["type"],
+                "entity_id": item.properties["ingest_entity_data"]["id"],
+                "data": dict(sg_published_files=list(item.properties.sg_publish_data_list),
+                             sg_status_list=None),
+                "multi_entity_update_modes": dict(sg_published_files='add'),
+            })
 
         try:
-            result = self.sgtk.shotgun.update(
-                entity_type=item.properties["ingest_entity_data"]["type"],
-                entity_id=item.properties["ingest_entity_data"]["id"],
-                data=dict(sg_published_files=sg_publish_data_list),
-                multi_entity_update_modes=dict(sg_published_files='add'),
-            )
-            return result
+            results = self.sgtk.shotgun.batch(batch_data)
         except Exception:
-            self.logger.error(
-                "link_published_files_to_entity failed for item: %s" % item.name,
+            self.logger.warning(
+                "Failed to link the PublishedFiles of %d items in a batch, linking them one by one." % len(items),
                 extra={
                     "action_show_more_info": {
                         "label": "Show Error Log",
@@ -645,7 +683,54 @@ class IngestFilesPlugin(HookBaseClass):
                     }
                 }
             )
-            return
+
+            results = list()
+            for item, request in zip(items, batch_data):
+                try:
+                    results.append(self.sgtk.shotgun.update(
+                        entity_type=request["entity_type"],
+                        entity_id=request["entity_id"],
+                        data=request["data"],
+                        multi_entity_update_modes=request["multi_entity_update_modes"],
+                    ))
+                except Exception:
+                    self.logger.error(
+                        "link_published_files_to_entity failed for item: %s" % item.name,
+                        extra={
+                            "action_show_more_info": {
+                                "label": "Show Error Log",
+                                "tooltip": "Show the error log",
+                                "text": traceback.format_exc()
+                            }
+                        }
+                    )
+                    results.append(None)
+
+        failed_items = list()
+        for (task_settings, item), result in zip(pending_items, results):
+            if result:
+                self.logger.info("%s entity registered and PublishedFile linked for %s" %
+                                 (item.properties["linked_entity_type"], item.name))
+            else:
+                # undo the linked_entity creation
+                self.undo(task_settings, item)
+                # undo the parent publish
+                super(IngestFilesPlugin, self).undo(task_settings, item)
+                self.logger.error("Failed to link the PublishedFile and the %s entity for %s!" %
+                                  (item.properties["linked_entity_type"], item.name))
+                failed_items.append(item.name)
+
+        if failed_items:
+            self.logger.error(
+                "Failed to link the PublishedFiles of %d out of %d items." % (len(failed_items), len(items)),
+                extra={
+                    "action_show_more_info": {
+                        "label": "Show Items",
+                        "tooltip": "Show the items that failed",
+                        "text": "\n".join(failed_items)
+                    }
+                }
+            )
 
     def _get_publish_version(self, task_settings, item):
         """
@@ -11,9 +11,12 @@
 # in-built modules
 import os
 import re
+import time
 import traceback
 import copy
 
+from multiprocessing.pool import ThreadPool
+
 # external modules
 from xml.dom import minidom
 
@@ -28,6 +31,17 @@ class UploadNotesPlugin(HookBaseClass):
     Inherits from PublishFilesPlugin
     """
 
+    def __init__(self, parent, **kwargs):
+        """
+        Construction
+        """
+        # call base init
+        super(UploadNotesPlugin, self).__init__(parent, **kwargs)
+
+        # thread pools uploading the note attachments, keyed by their thread count.
+        # the uploads of a note start as soon as it is published, and are joined in finalize.
+        self._upload_pools = dict()
+
     @property
     def settings_schema(self):
         """
@@ -91,6 +105,22 @@ class UploadNotesPlugin(HookBaseClass):
         schema["Item Type Settings"]["values"]["items"].update(ingest_schema)
 
         schema["Item Type Filters"]["default_value"] = ["notes.entity.*"]
+
+        schema["Upload Threads"] = {
+            "type": "int",
+            "allows_empty": True,
+            "default_value": 4,
+            "description": (
+                "Number of notes whose attachments are uploaded concurrently, each thread uses its own "
+                "Shotgun connection. The attachments of a note are always uploaded in order."
+            )
+        }
+        schema["Upload Retries"] = {
+            "type": "int",
+            "allows_empty": True,
+            "default_value": 3,
+            "description": "Number of times a failed attachment upload is retried, with an exponential backoff."
+        }
         return schema
 
     @property
@@ -117,6 +147,9 @@ class UploadNotesPlugin(HookBaseClass):
         :returns: True if item is valid, False otherwise.
         """
 
+        # validation always runs before publish, let the pools of the previous publish wind down.
+        self._close_upload_pools()
+
         fields = item.properties.fields
         status = True
 
@@ -301,37 +334,127 @@ class UploadNotesPlugin(HookBaseClass):
 
     def _upload_attachments(self, task_settings, item):
         """
-        Uploads any generic file attachments to Shotgun, parenting
-        them to the Note entity.
+        Starts uploading the generic file attachments of the item to Shotgun in the background,
+        parenting them to the Note entity. The upload is joined in finalize.
 
         :param task_settings:   The Note entity to attach the files to in SG.
         :param item:              A Shotgun API handle.
         """
+        file_paths = list()
+
         for file_path in item.properties.fields.get("attachments", []):
             if os.path.exists(file_path):
-                self._upload_file(task_settings, item, file_path)
+                file_paths.append(file_path)
             else:
                 self.logger.warning(
                     "File does not exist and will not be uploaded: %s" % file_path
                 )
 
-    def _upload_file(self, task_settings, item, file_path):
+        if file_paths:
+            self.logger.info("Uploading %d attachments in the background..." % len(file_paths))
+            upload_pool = self._get_upload_pool(task_settings)
+            item.properties["attachment_upload"] = upload_pool.apply_async(self._upload_note_attachments,
+                                                                           (task_settings, item, file_paths))
+
+    def _upload_file(self, task_settings, item, file_path, retries=0):
         """
         Uploads any generic file attachments to Shotgun, parenting
         them to the Note entity.
 
+        This is run from the upload threads, self.tank.shotgun is a connection dedicated to the thread.
+
         :param task_settings:   The Note entity to attach the files to in SG.
         :param item:              A Shotgun API handle.
         :param file_path:       The path to the file to upload to SG.
+        :param retries:         Number of times to retry a failed upload.
+        :return: size of the uploaded file in bytes
+        """
+        file_size = os.path.getsize(file_path)
+
+        for attempt in range(retries + 1):
+            try:
+                # upload to the notes entity
+                self.tank.shotgun.upload(item.properties.sg_note_data["type"],
+                                         item.properties.sg_note_data["id"],
+                                         str(file_path))
+                return file_size
+            except Exception:
+                if attempt == retries:
+                    raise
+                # back off before retrying, 1s, 2s, 4s...
+                time.sleep(2 ** attempt)
+
+    def _upload_note_attachments(self, task_settings, item, file_paths):
+        """
+        Uploads the attachments of a note in order, stopping at the first failure.
+
+        :param task_settings: Dictionary of Settings.
+        :param item: Item to process
+        :param file_paths: List of attachment paths
+        :return: tuple of (uploaded bytes, error log or None)
+        """
+        uploaded_bytes = 0
+        retries = task_settings["Upload Retries"].value or 0
+
+        for file_path in file_paths:
+            try:
+                uploaded_bytes += self._upload_file(task_settings, item, file_path, retries)
+            except Exception:
+                return uploaded_bytes, "Failed to upload %s\n%s" % (file_path, traceback.format_exc())
+
+        return uploaded_bytes, None
+
+    def _get_upload_pool(self, task_settings):
         """
-        self.logger.info(
-            "Uploading attachments (%s bytes)..." % os.path.getsize(file_path)
-        )
-        # upload to the notes entity
-        self.tank.shotgun.upload(item.properties.sg_note_data["type"],
-                                 item.properties.sg_note_data["id"],
-                                 str(file_path))
-        self.logger.info("Upload complete!")
+        Returns the pool of threads uploading the attachments, sized by the "Upload Threads" setting.
+
+        :param task_settings: Dictionary of Settings.
+        :return: ThreadPool
+        """
+        thread_count = max(1, task_settings["Upload Threads"].value or 1)
+
+        if thread_count not in self._upload_pools:
+            self._upload_pools[thread_count] = ThreadPool(thread_count)
+
+        return self._upload_pools[thread_count]
+
+    def _close_upload_pools(self):
+        """
+        Closes the upload pools, the uploads already started are still completed.
+        """
+        for upload_pool in self._upload_pools.itervalues():
+            upload_pool.close()
+
+        self._upload_pools = dict()
+
+    def _join_attachment_upload(self, item):
+        """
+        Waits for the attachments of the item to be uploaded.
+        The upload error is stored in the "attachment_upload_error" property of the item.
+
+        :param item: Item to process
+        """
+        attachment_upload = item.properties.get("attachment_upload")
+        if not attachment_upload:
+            return
+
+        item.properties["attachment_upload"] = None
+        uploaded_bytes, error = attachment_upload.get()
+        item.properties["attachment_upload_error"] = error
+
+        if error:
+            self.logger.error(
+                "Failed to upload the attachments for: %s" % item.name,
+                extra={
+                    "action_show_more_info": {
+                        "label": "Show Error Log",
+                        "tooltip": "Show the error log",
+                        "text": error
+                    }
+                }
+            )
+        else:
+            self.logger.info("Upload complete! %.1f MB uploaded." % (uploaded_bytes / 1048576.0))
 
     def publish(self, task_settings, item):
         """
@@ -427,6 +550,9 @@ class UploadNotesPlugin(HookBaseClass):
         :param item: Item to process
         """
 
+        # wait for the attachments of this note to be uploaded.
+        self._join_attachment_upload(item)
+
         if "sg_note_data" in item.properties:
 
             # get the data for the publish that was just created in SG
@@ -10,6 +10,7 @@
 
 import os
 import tempfile
+import time
 import maya.cmds as cmds
 import maya.mel as mel
 import sgtk
@@ -112,6 +113,13 @@ class MayaPublishGeometryPlugin(HookBaseClass):
                 "allows_empty": True,
                 "default_value": False
             }
+            schema["Batch Export LODs"] = {
+                "type": "bool",
+                "description": "Specifies whether to export the alembics of all the LODs being "
+                               "published in a single AbcExport call",
+                "allows_empty": True,
+                "default_value": True
+            }
         elif current_plugin == "Publish GPU Alembic Cache":
             schema["Item Type Settings"]["default_value"] = MAYA_GPU_ITEM_TYPE_SETTINGS
             schema["Export UVs"] = {
@@ -158,19 +166,17 @@ class MayaPublishGeometryPlugin(HookBaseClass):
         finally:
             abc_archive.close()
 
-    def _export_abc_cache(self, task_settings, item, export_path):
+    def _get_abc_job_args(self, task_settings, item, export_path, frame_range):
         """
-        This method is capable of exporting the scene in a gpu alembic cache.
+        Returns the AbcExport job arguments to export an LOD item.
 
         :param task_settings: Dictionary of Settings. The keys are strings, matching
             the keys returned in the settings property. The values are `Setting`
             instances.
         :param item: Item to process
         :param export_path: The output path to export files to
-
+        :param frame_range: (start frame, end frame) tuple
         """
-        publisher = self.parent
-
         # set the alembic args that make the most sense when working with Mari.
         # These flags will ensure the export of an Alembic file that contains
         # all visible geometry from the current scene together with UV's and
@@ -184,8 +190,7 @@ class MayaPublishGeometryPlugin(HookBaseClass):
             "-eulerFilter"
         ]
 
-        # find the animated frame range to use:
-        start_frame, end_frame = _find_scene_animation_range()
+        start_frame, end_frame = frame_range
         if start_frame and end_frame:
             alembic_args.append("-fr %d %d" % (start_frame, end_frame))
 
@@ -204,22 +209,95 @@ class MayaPublishGeometryPlugin(HookBaseClass):
         if task_settings["Strip Namespace"].value:
             alembic_args.append("-stripNamespaces")
 
+        return alembic_args
+
+    def _export_abc_caches(self, export_jobs):
+        """
+        Exports several LOD items in a single AbcExport call, one job per item,
+        so that the scene is only evaluated once per frame for all of them.
+
+        :param export_jobs: list of (task_settings, item, export_path) tuples
+        """
+        publisher = self.parent
+
+        # find the animated frame range to use:
+        frame_range = _find_scene_animation_range()
+
         # build the export command.  Note, use AbcExport -help in Maya for
         # more detailed Alembic export help
-        abc_export_cmd = ("AbcExport -j \"%s\"" % " ".join(alembic_args))
+        abc_export_cmd = "AbcExport %s" % " ".join(
+            "-j \"%s\"" % " ".join(self._get_abc_job_args(task_settings, item, export_path, frame_range))
+            for task_settings, item, export_path in export_jobs)
 
         try:
             publisher.log_debug("Executing command: %s" % abc_export_cmd)
             cmds.refresh(suspend=True)
-            mel.eval(abc_export_cmd)
-            cmds.refresh(suspend=False)
+            try:
+                mel.eval(abc_export_cmd)
+            finally:
+                cmds.refresh(suspend=False)
         except Exception as e:
             raise Exception("Failed to export Geometry: %s" % e)
 
-        self.logger.debug(
-            "Exported group %s to Temporary File > '%s'." % (item.properties.fields["node"],
-                                                             export_path)
-        )
+        for task_settings, item, export_path in export_jobs:
+            self.logger.debug(
+                "Exported group %s to Temporary File > '%s'." % (item.properties.fields["node"],
+                                                                 export_path)
+            )
+
+    def _export_abc_cache(self, task_settings, item, export_path):
+        """
+        This method is capable of exporting the scene in a gpu alembic cache.
+
+        :param task_settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        :param export_path: The output path to export files to
+
+        """
+        self._export_abc_caches([(task_settings, item, export_path)])
+
+    def _export_abc_batch(self, task_settings, item):
+        """
+        Exports the alembics of all the LOD items registered for the batched export
+        in one AbcExport call, and stores each item's temporary file and timing in
+        the "batched_abc_exports" property of the parent item.
+
+        :param task_settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        # the LOD items validated by this plugin, see validate
+        batch_items = item.parent.properties.get("lod_batch_items", dict()).values()
+        if not any(lod_item is item for _, lod_item in batch_items):
+            batch_items.append((task_settings, item))
+
+        batched_exports = item.parent.properties.setdefault("batched_abc_exports", dict())
+        export_jobs = []
+        for lod_task_settings, lod_item in batch_items:
+            publish_file_temp = tempfile.NamedTemporaryFile(mode='w+b', suffix='.abc')
+            export_path = publish_file_temp.name.replace("\\", "/")
+            batched_exports[lod_item.get_property("lod_full_name")] = {
+                "temp_file": publish_file_temp,
+                "path": export_path,
+            }
+            export_jobs.append((lod_task_settings, lod_item, export_path))
+
+        start_time = time.time()
+        try:
+            self._export_abc_caches(export_jobs)
+        except Exception:
+            for _, lod_item, _ in export_jobs:
+                batched_exports.pop(lod_item.get_property("lod_full_name"))["temp_file"].close()
+            raise
+        export_time = time.time() - start_time
+
+        self.logger.info("Exported %d LOD(s) in a single AbcExport call in %.2fs." %
+                         (len(export_jobs), export_time))
+        for _, lod_item, _ in export_jobs:
+            batched_exports[lod_item.get_property("lod_full_name")]["export_time"] = export_time
 
     def _export_gpu_abc_cache(self, task_settings, item, export_path):
         """
@@ -329,6 +407,17 @@ class MayaPublishGeometryPlugin(HookBaseClass):
             self.logger.error(error_msg)
             raise TankError(error_msg)
 
+        # drop any export left over by a previous publish of this LOD
+        batched_export = item.parent.properties.get("batched_abc_exports", {}).pop(
+            item.get_property("lod_full_name"), None)
+        if batched_export:
+            batched_export["temp_file"].close()
+
+        # register the LOD to be exported along with the other LODs validated by this plugin
+        if self.plugin.name == "Publish Geometry" and task_settings["Batch Export LODs"].value:
+            batch_items = item.parent.properties.setdefault("lod_batch_items", dict())
+            batch_items[item.get_property("lod_full_name")] = (task_settings, item)
+
         return super(MayaPublishGeometryPlugin, self).validate(task_settings, item)
 
     def publish_files(self, task_settings, item, publish_path):
@@ -342,21 +431,37 @@ class MayaPublishGeometryPlugin(HookBaseClass):
         :param item: Item to process
         :param publish_path: The output path to publish files to
         """
-        # Creating a temporary file on the publish path, where the alembic from maya would be
-        # exported
-        publish_file_temp = tempfile.NamedTemporaryFile(mode='w+b', suffix='.abc')
-
-        publish_path_temp = publish_file_temp.name.replace("\\", "/")
-
         # Deciding what type of alembic needs to be exported, based on the current plugin name
         current_plugin = self.plugin.name
 
+        batched_export = None
+        if current_plugin == "Publish Geometry" and task_settings["Batch Export LODs"].value:
+            # the first LOD published exports the alembics of all the others
+            batched_exports = item.parent.properties.get("batched_abc_exports", {})
+            if item.get_property("lod_full_name") not in batched_exports:
+                self._export_abc_batch(task_settings, item)
+            batched_export = item.parent.properties["batched_abc_exports"].pop(item.get_property("lod_full_name"))
+
+        if batched_export:
+            publish_file_temp = batched_export["temp_file"]
+            publish_path_temp = batched_export["path"]
+        else:
+            # Creating a temporary file on the publish path, where the alembic from maya would be
+            # exported
+            publish_file_temp = tempfile.NamedTemporaryFile(mode='w+b', suffix='.abc')
+
+            publish_path_temp = publish_file_temp.name.replace("\\", "/")
+
         # ensure the publish folder exists:
         publish_folder = os.path.dirname(publish_path)
         ensure_folder_exists(publish_folder)
 
         try:
-            if current_plugin == "Publish Geometry":
+            if batched_export:
+                self.logger.debug("Using batched export of %s, exported in %.2fs with the other LODs." %
+                                  (item.properties.fields["node"], batched_export["export_time"]))
+
+            elif current_plugin == "Publish Geometry":
                 # Exporting alembic to a temp location.
                 # This will later be renamed and written to the publish_path
                 self._export_abc_cache(task_settings=task_settings,
@@ -392,6 +497,26 @@ class MayaPublishGeometryPlugin(HookBaseClass):
 
         return [publish_path]
 
+    def finalize(self, task_settings, item):
+        """
+        Execute the finalization pass. This pass executes once all the publish
+        tasks have completed, and can for example be used to version up files.
+
+        :param task_settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        super(MayaPublishGeometryPlugin, self).finalize(task_settings, item)
+
+        # the publishes are over, destroy the temporary files of the LODs exported in the
+        # batch but not published, eg. when a sibling failed or was skipped.
+        batched_exports = item.parent.properties.get("batched_abc_exports", {})
+        for batched_export in batched_exports.itervalues():
+            batched_export["temp_file"].close()
+        batched_exports.clear()
+        item.parent.properties.get("lod_batch_items", {}).clear()
+
 
 def _find_scene_animation_range():
     """
@@ -9,7 +9,6 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import sgtk
-import nuke
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
@@ -79,5 +78,15 @@ class PostPhaseHook(HookBaseClass):
             if item.name == "Current Nuke Session":
                 if 'write_node_paths_dict' in item.properties:
                     item.properties['write_node_paths_dict'] = dict()
-                if 'visited_dict' in item.properties:
-                    item.properties['visited_dict'] = {node: 0 for node in nuke.allNodes(recurseGroups=True)}
+                if 'upstream_files_cache' in item.properties:
+                    item.properties['upstream_files_cache'] = dict()
+                if 'path_classifier' in item.properties:
+                    item.properties['path_classifier'] = None
+                if 'published_counterparts' in item.properties:
+                    item.properties['published_counterparts'] = dict()
+                if 'reported_file_paths' in item.properties:
+                    item.properties['reported_file_paths'] = set()
+                if 'sequence_inventories' in item.properties:
+                    item.properties['sequence_inventories'] = dict()
+                if 'sg_cut_ranges' in item.properties:
+                    item.properties['sg_cut_ranges'] = dict()
@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import re
 import glob
 import random
 import nuke
@@ -25,6 +26,8 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 USER_FILE_SETTING_NAME = "Error On User File"
 NODE_CLASSES_TO_EXCLUDE = "Node Classes To Exclude"
+# maximum number of paths sent in a single sg_path_to_source "in" filter
+SG_PATH_QUERY_CHUNK_SIZE = 500
 
 
 class DisplayUnpublishedFiles(QtWidgets.QWidget):
@@ -103,6 +106,118 @@ class DisplayUnpublishedFiles(QtWidgets.QWidget):
         self.main_dialog.exec_()
 
 
+class PathClassifier(object):
+    """
+    Classifies file paths as published, unpublished or invalid, with the valid
+    path globs merged into a single compiled regex and results memoized per path.
+    """
+    PUBLISHED = "published"
+    UNPUBLISHED = "unpublished"
+    INVALID = "invalid"
+
+    def __init__(self, valid_paths, show_path):
+        """
+        :param valid_paths: Dict with all the valid path globs for a particular show
+        :param show_path: Show path i.e /dd/shows/<SHOW>
+        """
+        self.valid_paths = valid_paths
+        self.show_path = show_path
+        # fnmatch.translate() appends its flags to the regex on python 2, which
+        # can't be merged with others, so they are passed to compile() instead
+        patterns = ["(?:%s)" % fnmatch.translate(pattern).replace("(?ms)", "")
+                    for pattern in valid_paths.itervalues()]
+        self._valid_regex = re.compile("|".join(patterns), re.MULTILINE | re.DOTALL)
+        self._classified = {}
+
+    def classify(self, file_path):
+        """
+        :param file_path: File path to classify
+        :return: One of PUBLISHED, UNPUBLISHED or INVALID
+        """
+        try:
+            return self._classified[file_path]
+        except KeyError:
+            pass
+
+        if self._valid_regex.match(file_path):
+            classification = self.PUBLISHED
+        elif self.show_path in file_path:
+            classification = self.UNPUBLISHED
+        else:
+            classification = self.INVALID
+
+        self._classified[file_path] = classification
+        return classification
+
+
+class SequenceInventory(object):
+    """
+    Frames found on disk for a rendered image sequence, scanned with a single
+    listing of the render directory.
+    """
+    # frame specs supported in sequence paths: %04d, %d, ####, @@@@
+    FRAME_SPEC_REGEX = re.compile(r"%0?(\d*)d|#+|@+")
+
+    def __init__(self, path, frame_file_regex):
+        self.path = path
+        self.frame_range = None
+        self.frame_count = 0
+        # list of (first, last) tuples of the frames missing within frame_range
+        self.missing_frames = []
+        self._frame_file_regex = frame_file_regex
+
+    @classmethod
+    def scan(cls, path):
+        """
+        Returns the inventory of a sequence path, scanning its directory.
+
+        :param path: Sequence path, with a frame spec
+        :return: SequenceInventory instance or None if the path has no frame spec
+        """
+        directory, file_pattern = os.path.split(path)
+        frame_specs = list(cls.FRAME_SPEC_REGEX.finditer(file_pattern))
+        if not frame_specs:
+            return None
+
+        # the last frame spec of the file name holds the frame number
+        frame_spec = frame_specs[-1]
+        if frame_spec.group(0).startswith("%"):
+            padding = int(frame_spec.group(1) or 1)
+        else:
+            padding = len(frame_spec.group(0))
+        frame_file_regex = re.compile("%s(-?\\d{%d,})%s\\Z" % (re.escape(file_pattern[:frame_spec.start()]),
+                                                             padding,
+                                                             re.escape(file_pattern[frame_spec.end():])))
+
+        inventory = cls(path, frame_file_regex)
+        inventory._scan(directory)
+        return inventory
+
+    def _scan(self, directory):
+        """
+        Lists the render directory once and stores the frames found as ranges.
+        """
+        scandir = getattr(os, "scandir", None)
+        match = self._frame_file_regex.match
+        try:
+            if scandir:
+                file_names = [entry.name for entry in scandir(directory)]
+            else:
+                file_names = os.listdir(directory)
+        except OSError:
+            return
+
+        frames = sorted(set(int(frame_match.group(1)) for frame_match in
+                            (match(file_name) for file_name in file_names) if frame_match))
+        if not frames:
+            return
+
+        self.frame_range = (frames[0], frames[-1])
+        self.frame_count = len(frames)
+        self.missing_frames = [(previous + 1, frame - 1) for previous, frame in zip(frames, frames[1:])
+                               if frame - previous > 1]
+
+
 class NukePublishDDValidationPlugin(HookBaseClass):
     """
     Inherits from NukePublishFilesPlugin
@@ -177,14 +292,25 @@ class NukePublishDDValidationPlugin(HookBaseClass):
         :return: True if yes false otherwise
         """
         lss_path = item.properties['node']['cached_path'].value()
-        lss_data = frangetools.getSequence(lss_path)
 
         log_method = item.properties.get("log_method", "warning")
 
-        # Since lss_data will be a list of dictionaries,
-        # building a dictionary from key value for the ease of fetching data.
-        info_by_path = self._build_dict(lss_data, key="path")
-        missing_frames = info_by_path.get(lss_path)['missing_frames']
+        # render directories are scanned once per validation pass
+        inventories = item.parent.properties.setdefault('sequence_inventories', dict())
+        if lss_path not in inventories:
+            inventories[lss_path] = SequenceInventory.scan(lss_path)
+
+        inventory = inventories[lss_path]
+        if inventory is not None:
+            missing_frames = inventory.missing_frames
+            frame_range = inventory.frame_range
+        else:
+            lss_data = frangetools.getSequence(lss_path)
+            # Since lss_data will be a list of dictionaries,
+            # building a dictionary from key value for the ease of fetching data.
+            info_by_path = self._build_dict(lss_data, key="path")
+            missing_frames = info_by_path.get(lss_path)['missing_frames']
+            frame_range = info_by_path.get(lss_path)['frame_range']
         root = nuke.Root()
 
         # If there are no missing frames, then checking if the first and last frames match with root first and last
@@ -194,15 +320,16 @@ class NukePublishDDValidationPlugin(HookBaseClass):
         else:
             log = self.logger.warning
 
-        if missing_frames:
+        # nothing rendered at all is reported as incomplete renders too
+        if missing_frames or not frame_range:
             log("Renders Mismatch! Incomplete renders on disk.")
             if log_method == "warning":
                 nuke.message("WARNING!\n"+item.properties['node'].name() +
                              "\nRenders Mismatch! Incomplete renders on disk.")
             return False if log_method == "error" else True
         else:
-            first_rendered_frame = info_by_path.get(lss_path)['frame_range'][0]
-            last_rendered_frame = info_by_path.get(lss_path)['frame_range'][1]
+            first_rendered_frame = frame_range[0]
+            last_rendered_frame = frame_range[1]
 
             if (first_rendered_frame > root.firstFrame()) or (last_rendered_frame < root.lastFrame()):
                 log("Renders Mismatch! Incomplete renders on disk.")
@@ -218,65 +345,141 @@ class NukePublishDDValidationPlugin(HookBaseClass):
                 return False if log_method == "error" else True
         return True
 
-    def _collect_file_nodes_in_graph(self, node, visited_files, task_settings):
+    def _collect_file_nodes_in_graph(self, node, task_settings, upstream_cache):
         """
         Traverses the graph for the write node being validated and collects all the
         nodes with file knobs and their respective file values
 
-        :param node: The node being visited in the graph
-        :param visited_files: Dictionary of nodes and associated files
-        :return: Dictionary of all the file nodes in the graph and associated files
-        """
-        if node.Class() in task_settings[NODE_CLASSES_TO_EXCLUDE].value:
-            self.visited_dict[node] = 1
-
-        if self.visited_dict[node] == 0:
-            # get the file path if exists
-            if self._contains_active_file_knob(node):
-                node_file_path = node['file'].value()
-                if node_file_path:
-                    visited_files.setdefault(node_file_path, []).append(nuke.Node.fullName(node))
-            # set visited to 1 for the node so as not to revisit
-            self.visited_dict[node] = 1
-            dep = node.dependencies()
-            if dep:
-                for item in dep:
-                    self._collect_file_nodes_in_graph(item, visited_files, task_settings)
+        :param node: The write node being validated
+        :param task_settings: Dictionary of Settings
+        :param upstream_cache: Dictionary of nodes and the file nodes upstream of them,
+                               shared by all the write nodes of a validation pass
+        :return: Dictionary of all the files in the graph and associated file nodes
+        """
+        visited_files = {}
+        file_nodes = self._get_upstream_file_nodes(node, task_settings[NODE_CLASSES_TO_EXCLUDE].value,
+                                                   upstream_cache)
+        for file_node in file_nodes:
+            node_file_path = file_node['file'].value()
+            if node_file_path:
+                visited_files.setdefault(node_file_path, []).append(nuke.Node.fullName(file_node))
+
+        for node_names in visited_files.itervalues():
+            node_names.sort()
 
         return visited_files
 
+    def _get_upstream_file_nodes(self, node, excluded_classes, upstream_cache):
+        """
+        Iteratively walks the dependencies of a node and returns the nodes with an
+        active file knob found upstream of it, including the node itself.
+
+        The file nodes upstream of every node walked are stored in upstream_cache,
+        so branches shared between write nodes are only walked once.
+
+        :param node: The node to start from
+        :param excluded_classes: Node classes which are neither collected nor walked through
+        :param upstream_cache: Dictionary of nodes and the file nodes upstream of them
+        :return: frozenset of file nodes
+        """
+        stack = [(node, None)]
+        while stack:
+            current, dependencies = stack.pop()
+
+            if dependencies is None:
+                if current in upstream_cache:
+                    continue
+                if current.Class() in excluded_classes:
+                    upstream_cache[current] = frozenset()
+                    continue
+                # mark the node as in progress, so that a cycle through expression
+                # links doesn't walk it again, then come back once its inputs are done
+                upstream_cache[current] = None
+                dependencies = current.dependencies() or []
+                stack.append((current, dependencies))
+                stack.extend((dependency, None) for dependency in dependencies
+                             if dependency not in upstream_cache)
+            else:
+                file_nodes = set()
+                if self._contains_active_file_knob(current):
+                    file_nodes.add(current)
+                for dependency in dependencies:
+                    file_nodes.update(upstream_cache.get(dependency) or ())
+                upstream_cache[current] = frozenset(file_nodes)
+
+        return upstream_cache[node]
+
     @staticmethod
-    def _check_file_validity(visited_files, suspicious_paths, valid_paths, show_path):
+    def _check_file_validity(visited_files, suspicious_paths, path_classifier):
         """
         Checks for unpublished and invalid paths in files collected after graph traversal
         :param visited_files: File nodes and associated files collected during traversal
         :param suspicious_paths: Dict to capture unpublished/invalid paths
-        :param valid_paths: Dict with all the valid paths for a particular show
-        :param show_path: Show path i.e /dd/shows/<SHOW>
+        :param path_classifier: PathClassifier for the valid paths of a particular show
         :return: Suspicious files found among the visited files
         """
         for file_path in visited_files:
-            valid_patterns = [pattern for pattern in valid_paths.itervalues()]
-            matches_valid_pattern = any([fnmatch.fnmatch(file_path, pattern) for pattern in valid_patterns])
-            if show_path in file_path and not matches_valid_pattern:
+            classification = path_classifier.classify(file_path)
+            if classification == PathClassifier.UNPUBLISHED:
                 suspicious_paths['unpublished'].append(file_path)
-            elif show_path not in file_path and not matches_valid_pattern:
+            elif classification == PathClassifier.INVALID:
                 suspicious_paths['invalid'].append(file_path)
         return suspicious_paths
 
-    def _get_published_counterparts(self, unpublished_files):
+    def _get_published_counterparts(self, unpublished_files, counterparts_cache=None):
         """
         Query shotgun and get published counterparts of the unpublished files
 
         :param unpublished_files: Unpublished files in the nuke script
+        :param counterparts_cache: Dict of paths already queried and their sg data (or None),
+                                   updated with the paths queried here
         :return: Queried sg data for files which have published versions
         """
-        filters = [["project.Project.name", "is", os.environ['DD_SHOW']], ['sg_path_to_source', 'in', unpublished_files]]
-        fields = ['path', 'entity', 'task'] + self._breakdown_app.get_setting('additional_publish_fields')
-        sg_data = self.parent.engine.shotgun.find('PublishedFile', filters, fields)
-        sg_data = {entity['sg_path_to_source']: entity for entity in sg_data}
+        if counterparts_cache is None:
+            counterparts_cache = dict()
+
+        to_query = list(set(path for path in unpublished_files if path not in counterparts_cache))
+        if to_query:
+            fields = ['path', 'entity', 'task'] + self._breakdown_app.get_setting('additional_publish_fields')
+            for path in to_query:
+                counterparts_cache[path] = None
+
+            for index in range(0, len(to_query), SG_PATH_QUERY_CHUNK_SIZE):
+                filters = [["project.Project.name", "is", os.environ['DD_SHOW']],
+                           ['sg_path_to_source', 'in', to_query[index:index + SG_PATH_QUERY_CHUNK_SIZE]]]
+                for entity in self.parent.engine.shotgun.find('PublishedFile', filters, fields):
+                    counterparts_cache[entity['sg_path_to_source']] = entity
+
+        sg_data = {path: counterparts_cache[path] for path in unpublished_files if counterparts_cache[path]}
         return sg_data
 
+    def _prefetch_published_counterparts(self, task_settings, item):
+        """
+        Collects the unpublished files upstream of all the write nodes of the session
+        and queries their published counterparts at once, so that validating each
+        write node doesn't need its own shotgun query.
+
+        :param task_settings: Dictionary of Settings
+        :param item: Session item, parent of the write node items
+        """
+        if not task_settings[USER_FILE_SETTING_NAME].value or not self._breakdown_app:
+            return
+
+        upstream_cache = item.properties['upstream_files_cache']
+        path_classifier = self._get_path_classifier(item)
+
+        unpublished_files = set()
+        for child in item.children:
+            node = child.properties.get("node")
+            if not node:
+                continue
+            visited_files = self._collect_file_nodes_in_graph(node, task_settings, upstream_cache)
+            unpublished_files.update(path for path in visited_files
+                                     if path_classifier.classify(path) == PathClassifier.UNPUBLISHED)
+
+        if unpublished_files:
+            self._get_published_counterparts(unpublished_files, item.properties['published_counterparts'])
+
     def _rewire_script_and_report(self, suspicious_paths, visited_files, sg_data, display_files):
         """
         Replace nodes with unpublished file paths and update to have sgtk metadata
@@ -380,6 +583,26 @@ class NukePublishDDValidationPlugin(HookBaseClass):
         progress_note.setStyleSheet("color: {};".format(color))
         progress_note.setText(message)
 
+    @staticmethod
+    def _get_path_classifier(session_item):
+        """
+        Returns the PathClassifier of the current validation pass, stored on the session item.
+
+        :param session_item: Session item, parent of the write node items
+        :return: PathClassifier instance
+        """
+        path_classifier = session_item.properties.get('path_classifier')
+        if path_classifier is None:
+            show_path = os.path.join(os.environ['DD_SHOWS_ROOT'], os.environ['DD_SHOW'])
+            valid_paths = {
+                'dd_library': os.path.join(os.environ['DD_ROOT'], 'library', '**'),  # dd library path
+                'shot_pub': os.path.join(show_path, '**', 'SHARED', '*'),  # shot published glob
+                'show_pub': os.path.join(show_path, 'SHARED', '*'),  # show published glob
+            }
+            path_classifier = PathClassifier(valid_paths, show_path)
+            session_item.properties['path_classifier'] = path_classifier
+        return path_classifier
+
     def _read_and_camera_file_paths(self, task_settings, item):
         """
         Checks if the files loaded are published or from valid locations i.e
@@ -392,14 +615,8 @@ class NukePublishDDValidationPlugin(HookBaseClass):
         """
         status = True
         logger_method = None
-        self.visited_dict = item.parent.properties['visited_dict']
-
-        show_path = os.path.join(os.environ['DD_SHOWS_ROOT'], os.environ['DD_SHOW'])
-        valid_paths = {
-            'dd_library': os.path.join(os.environ['DD_ROOT'], 'library', '**'),  # dd library path
-            'shot_pub': os.path.join(show_path, '**', 'SHARED', '*'),  # shot published glob
-            'show_pub': os.path.join(show_path, 'SHARED', '*'),  # show published glob
-        }
+        upstream_cache = item.parent.properties.setdefault('upstream_files_cache', dict())
+        path_classifier = self._get_path_classifier(item.parent)
 
         # Collect all the nodes associated with a write node
         # For all the read, readgeo and camera nodes present in the write node graph, check for 'file' knob.
@@ -408,10 +625,14 @@ class NukePublishDDValidationPlugin(HookBaseClass):
             'unpublished': [],
             'invalid': [],
         }
-        visited_files = {}
-        self._collect_file_nodes_in_graph(item.properties['node'], visited_files, task_settings)
-        self._check_file_validity(visited_files, suspicious_paths, valid_paths, show_path)
-        item.parent.properties['visited_dict'] = self.visited_dict
+        visited_files = self._collect_file_nodes_in_graph(item.properties['node'], task_settings, upstream_cache)
+        self._check_file_validity(visited_files, suspicious_paths, path_classifier)
+
+        # Write nodes sharing upstream branches see the same files, only report each path once per pass
+        reported_paths = item.parent.properties.setdefault('reported_file_paths', set())
+        for key, paths in suspicious_paths.iteritems():
+            suspicious_paths[key] = [path for path in paths if path not in reported_paths]
+            reported_paths.update(suspicious_paths[key])
 
         if suspicious_paths['unpublished']:
             unpublished = ""
@@ -421,7 +642,8 @@ class NukePublishDDValidationPlugin(HookBaseClass):
 
             user_file_error = task_settings[USER_FILE_SETTING_NAME].value
             if user_file_error:
-                sg_data = self._get_published_counterparts(suspicious_paths['unpublished'])
+                counterparts_cache = item.parent.properties.setdefault('published_counterparts', dict())
+                sg_data = self._get_published_counterparts(suspicious_paths['unpublished'], counterparts_cache)
                 gifs_path = self.parent.expand_path("{config}/resources")
                 display_files = DisplayUnpublishedFiles(message, unpublished, gifs_path)
                 display_files.create_ui()
@@ -470,7 +692,7 @@ class NukePublishDDValidationPlugin(HookBaseClass):
                                   "action_show_more_info": {
                                       "label": "Show Info",
                                       "tooltip": "Show invalid path(s)",
-                                      "text": "Paths not in {}: {}".format(valid_paths.values(), paths)
+                                      "text": "Paths not in {}: {}".format(path_classifier.valid_paths.values(), paths)
                                   }
                               }
                               )
@@ -510,9 +732,15 @@ class NukePublishDDValidationPlugin(HookBaseClass):
             out_field = frame_range_app.get_setting("sg_out_frame_field")
             fields = [in_field, out_field]
 
-            # get the field information from shotgun based on Shot
+            # get the field information from shotgun based on Shot, once per publish session
             # sg_cut_in and sg_cut_out info will be on Shot entity, so skip in case this info is not present
-            data = self.sgtk.shotgun.find_one(sg_entity_type, filters=sg_filters, fields=fields)
+            session_item = item.parent if item.properties.get("node") else item
+            cut_ranges = session_item.properties.setdefault('sg_cut_ranges', dict())
+            cut_range_key = (sg_entity_type, entity["id"], in_field, out_field)
+            if cut_range_key not in cut_ranges:
+                cut_ranges[cut_range_key] = self.sgtk.shotgun.find_one(sg_entity_type, filters=sg_filters,
+                                                                       fields=fields) or dict()
+            data = cut_ranges[cut_range_key]
             if in_field not in data or out_field not in data:
                 return True
             elif data[in_field] is None or data[out_field] is None:
@@ -599,11 +827,17 @@ class NukePublishDDValidationPlugin(HookBaseClass):
         status = True
         # Segregating the checks, specifically for general nuke script
         if item.type == 'nuke.session':
-            status = self._non_sgtk_writes() and status
-            status = self._sync_frame_range(item) and status
             # Properties to be used by child write nodes
-            item.properties['visited_dict'] = {node: 0 for node in nuke.allNodes(recurseGroups=True)}
+            item.properties['upstream_files_cache'] = dict()
+            item.properties['path_classifier'] = None
+            item.properties['published_counterparts'] = dict()
+            item.properties['reported_file_paths'] = set()
+            item.properties['sequence_inventories'] = dict()
+            item.properties['sg_cut_ranges'] = dict()
             item.properties['write_node_paths_dict'] = dict()
+            status = self._non_sgtk_writes() and status
+            status = self._sync_frame_range(item) and status
+            self._prefetch_published_counterparts(task_settings, item)
 
         # Segregating the checks, specifically for write nodes
         if item.properties.get("node"):
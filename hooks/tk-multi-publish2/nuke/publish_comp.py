@@ -15,8 +15,6 @@ import itertools
 from dd.runtime import api
 api.load("frangetools")
 import frangetools
-api.load("preferences")
-import preferences
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
@@ -53,7 +51,9 @@ class NukePublishDDCompValidationPlugin(HookBaseClass):
         tolerance_h = (bb_height - node_h) / node_h * 100
         tolerance_w = (bb_width - node_w) / node_w * 100
 
-        nuke_prefs = preferences.Preferences(pref_file_name="nuke_preferences.yaml")
+        nuke_prefs = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name="nuke_preferences.yaml")
 
         if nuke_prefs.get('bb_size'):
             bbsize = nuke_prefs['bb_size']
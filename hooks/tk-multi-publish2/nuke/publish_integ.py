@@ -11,9 +11,6 @@
 import os
 import nuke
 import sgtk
-from dd.runtime import api
-api.load('preferences')
-import preferences
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
@@ -41,7 +38,9 @@ class NukePublishDDIntegValidationPlugin(HookBaseClass):
         tolerance_h = (bb_height - node_h) / node_h * 100
         tolerance_w = (bb_width - node_w) / node_w * 100
 
-        nuke_prefs = preferences.Preferences(pref_file_name="nuke_preferences.yaml")
+        nuke_prefs = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name="nuke_preferences.yaml")
 
         if nuke_prefs.get('bb_size'):
             bbsize = nuke_prefs['bb_size']
@@ -10,8 +10,16 @@ import time
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# matches the [* *] variables of a nuke script, captured so that re.split()
+# keeps them in the token list
+VARIABLE_REGEX = re.compile(r"(\[\*[A-Za-z_ %/:0-9()\-,.\+]+\*\])")
+
+
 class PreprocessNuke(HookBaseClass):
 
+    # tokenized nuke scripts, keyed by path, stored along with their mtime
+    _script_template_cache = {}
+
     def get_processed_script(self, nuke_script_path, **kwargs):
         replace_data = kwargs.get("fields", {})
 
@@ -61,11 +69,8 @@ class PreprocessNuke(HookBaseClass):
         processed_script_path = os.path.join("/var", "tmp", tmp_file_name)
 
         self.parent.log_debug("Saving nuke script to: {}".format(processed_script_path))
-        with open(nuke_script_path, 'r') as source_script_file, open(processed_script_path,
-                                                                    'w') as tmp_script_file:
-            nuke_script_text = source_script_file.read()
-            nuke_script_text = self._replace_vars(nuke_script_text, replace_data)
-            tmp_script_file.write(nuke_script_text)
+        with open(processed_script_path, 'w') as tmp_script_file:
+            tmp_script_file.write(self._get_processed_script_text(nuke_script_path, replace_data))
 
         return processed_script_path
 
@@ -73,77 +78,123 @@ class PreprocessNuke(HookBaseClass):
     def remove_html(string):
         return re.sub('<.+?>', '', string)
 
-    def _replace_vars(self, attr, data):
+    def _get_processed_script_text(self, nuke_script_path, data):
         """
-        Replace the variables in a nuke script
-        Variables defined by [* *] or \[* *]
+        Returns the text of the nuke script with its variables replaced.
+        The script is only read and tokenized again when it changes on disk.
+        """
+        return self._render_script_template(self._get_script_template(nuke_script_path), data)
+
+    def _get_script_template(self, nuke_script_path):
+        """
+        Returns the tokenized nuke script, cached by path and mtime.
+        """
+        cls = self.__class__
+        mtime = os.path.getmtime(nuke_script_path)
+
+        cached = cls._script_template_cache.get(nuke_script_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(nuke_script_path, 'r') as source_script_file:
+            template = self._tokenize_script(source_script_file.read())
+
+        cls._script_template_cache[nuke_script_path] = (mtime, template)
+        return template
+
+    @staticmethod
+    def _tokenize_script(attr):
+        """
+        Splits a nuke script into literal text and [* *] variables.
+
+        :returns: dict with the "tokens" list, where odd indices are variables,
+                  and the set of "message_vars", the variables whose first
+                  occurrence sits on a message knob line.
         """
         # get rid of nukes escape characters (fancy, huh)
         attr = attr.replace("\[*", "[*")
 
-        # look for anything with a [* *] pattern
-        vars = re.compile("\[\*[A-Za-z_ %/:0-9()\-,.\+]+\*\]").findall(attr)
+        tokens = VARIABLE_REGEX.split(attr)
+
+        message_vars = set()
+        for var in set(tokens[1::2]):
+            index = attr.find(var)
+            line_start = attr.rfind("\n", 0, index) + 1
+            line_end = attr.find("\n", index)
+            line = attr[line_start:line_end] if line_end != -1 else attr[line_start:]
+            if line.count('message') > 0:
+                message_vars.add(var)
 
+        return {"tokens": tokens, "message_vars": message_vars}
+
+    def _render_script_template(self, template, data):
+        """
+        Resolves every distinct variable of a tokenized script once and joins
+        the tokens back together.
+        """
+        tokens = template["tokens"]
         dt = datetime.datetime.now()
 
-        for var in vars:
-            var_tmp = var.replace("[*", "").replace("*]", "")
-            # Replace the date/time variables
-            if var_tmp.startswith('date '):
-                date_str = var_tmp.replace('date ', '')
-                attr = attr.replace(var, dt.strftime(date_str))
-
-            # Replace the frame number variables
-            elif (var_tmp.lower() == "numframes" and
-                          data.get('first_frame') != None and data.get('first_frame') != '' and
-                          data.get('last_frame') != None and data.get('last_frame') != ''):
-                range = str(int(data.get('lf')) - int(data.get('first_frame')))
-                attr = attr.replace(var, range)
-
-            # and the increment that may be at the end of the frame number
-            elif "+" in var_tmp.lower():
-                (tmp, num) = var_tmp.split("+")
-                sum = str(int(data.get(tmp)) + int(num))
-                attr = attr.replace(var, sum)
-
-            # make it easier to enter screen coordinates
-            # that vary with resolution, by normalizing to
-            # (-0.5 -0.5) to (0.5 0.5)
-            elif "screenspace" in var_tmp.lower():
-                var_tmp = var_tmp.replace("(", " ").replace(",", " ").replace(")", " ")
-                (key, xString, yString) = var_tmp.split()
-                xFloat = float(xString) + 0.5
-                yFloat = float(yString) + 0.5
-                translateString = (
-                "{{SHUFFLE_CONSTANT.actual_format.width*(%s) i} {SHUFFLE_CONSTANT.actual_format.height*(%s) i}}" % (
+        values = {}
+        for var in tokens[1::2]:
+            if var not in values:
+                values[var] = self._resolve_var(var, data, dt, var in template["message_vars"])
+
+        rendered = list(tokens)
+        rendered[1::2] = [values[var] for var in tokens[1::2]]
+        return "".join(rendered)
+
+    def _replace_vars(self, attr, data):
+        """
+        Replace the variables in a nuke script
+        Variables defined by [* *] or \[* *]
+        """
+        return self._render_script_template(self._tokenize_script(attr), data)
+
+    def _resolve_var(self, var, data, dt, on_message_line):
+        """
+        Returns the replacement text of a single [* *] variable.
+        """
+        var_tmp = var.replace("[*", "").replace("*]", "")
+        # Replace the date/time variables
+        if var_tmp.startswith('date '):
+            date_str = var_tmp.replace('date ', '')
+            return dt.strftime(date_str)
+
+        # Replace the frame number variables
+        elif (var_tmp.lower() == "numframes" and
+                      data.get('first_frame') != None and data.get('first_frame') != '' and
+                      data.get('last_frame') != None and data.get('last_frame') != ''):
+            return str(int(data.get('lf')) - int(data.get('first_frame')))
+
+        # and the increment that may be at the end of the frame number
+        elif "+" in var_tmp.lower():
+            (tmp, num) = var_tmp.split("+")
+            return str(int(data.get(tmp)) + int(num))
+
+        # make it easier to enter screen coordinates
+        # that vary with resolution, by normalizing to
+        # (-0.5 -0.5) to (0.5 0.5)
+        elif "screenspace" in var_tmp.lower():
+            var_tmp = var_tmp.replace("(", " ").replace(",", " ").replace(")", " ")
+            (key, xString, yString) = var_tmp.split()
+            xFloat = float(xString) + 0.5
+            yFloat = float(yString) + 0.5
+            return ("{{SHUFFLE_CONSTANT.actual_format.width*(%s) i} {SHUFFLE_CONSTANT.actual_format.height*(%s) i}}" % (
                 str(xFloat), str(yFloat)))
-                attr = attr.replace(var, translateString)
-
-            # TODO: do we handle this differently?
-            # Replace the showname
-            # (now resolved in resolveMainProcessVariables)
-            elif var_tmp == "showname":
-                attr = attr.replace(var, str(data.get('showname')))
-
-            # remove knobs that have a [**] value but nothing in data
-            elif (data.get(var_tmp) == '' or
-                          data.get(var_tmp) == None or
-                          data.get(var_tmp) == "None"):
-                regexp = ".*\[\*"
-                regexp += var_tmp
-                regexp += "\*\].*"
-                line = re.compile(regexp).findall(attr)
-                if line != None and len(line) > 0:
-                    if line[0].count('message') > 0:
-                        attr = attr.replace(var, str('""'))
-                    else:
-                        attr = attr.replace(var, "None")
-
-            else:
-                replaceval = self.remove_html(str(data.get(var_tmp)))
-                if (replaceval == ""):
-                    replaceval == '""'
-                attr = attr.replace(var, str(replaceval))
-
-        return attr
-    # end replaceVars
\ No newline at end of file
+
+        # TODO: do we handle this differently?
+        # Replace the showname
+        # (now resolved in resolveMainProcessVariables)
+        elif var_tmp == "showname":
+            return str(data.get('showname'))
+
+        # remove knobs that have a [**] value but nothing in data
+        elif (data.get(var_tmp) == '' or
+                      data.get(var_tmp) == None or
+                      data.get(var_tmp) == "None"):
+            if on_message_line:
+                return str('""')
+            return "None"
+
+        return str(self.remove_html(str(data.get(var_tmp))))
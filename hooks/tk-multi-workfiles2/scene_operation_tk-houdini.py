@@ -14,9 +14,6 @@ import hou
 import sgtk
 from sgtk import TankError
 from sgtk.platform.qt import QtGui
-from dd.runtime import api
-api.load("preferences")
-import preferences
 
 HookClass = sgtk.get_hook_baseclass()
 
@@ -115,10 +112,12 @@ class SceneOperation(HookClass):
                 QtGui.QMessageBox.warning(None, "Entity has no in/out frame", warning_message)
 
     def set_show_preferences(self, fields):
-        show_prefs = preferences.Preferences(pref_file_name="show_preferences.yaml",
-                                             role=fields.get("Step"),
-                                             seq_override=fields.get("Sequence"),
-                                             shot_override=fields.get("Shot"))
+        show_prefs = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name="show_preferences.yaml",
+            role=fields.get("Step"),
+            seq_override=fields.get("Sequence"),
+            shot_override=fields.get("Shot"))
         try:
             hou.setFps(show_prefs["show_settings"]["fps"])
         except KeyError as ke:
@@ -18,11 +18,6 @@ from sgtk.platform.qt import QtGui
 
 HookClass = sgtk.get_hook_baseclass()
 
-from dd.runtime import api
-
-api.load("preferences")
-import preferences
-
 SHOW_FORMAT_NAME = 'SHOW_FORMAT'
 
 class SceneOperation(HookClass):
@@ -190,10 +185,12 @@ class SceneOperation(HookClass):
                 QtGui.QMessageBox.warning(None, "Entity has no in/out frame", warning_message)
 
     def set_show_preferences(self, fields):
-        show_prefs = preferences.Preferences(pref_file_name="show_preferences.yaml",
-                                             role=fields.get("Step"),
-                                             seq_override=fields.get("Sequence"),
-                                             shot_override=fields.get("Shot"))
+        show_prefs = self.parent.sgtk.execute_core_hook_method(
+            "get_preference", "get_preferences",
+            pref_file_name="show_preferences.yaml",
+            role=fields.get("Step"),
+            seq_override=fields.get("Sequence"),
+            shot_override=fields.get("Shot"))
 
         try:
             pixel_aspect_ratio = show_prefs["show_settings"]["resolution"].get("pixel_aspect_ratio")